@@ -14,6 +14,9 @@ setup(
     keywords = ['time-series', 'time series', 'data analysis'],
     python_requires = '>=3.7',
     package_data = {},
+    entry_points = {
+        'console_scripts' : ['tsa-explore=tsa._cli:main'],
+    },
     zip_safe = False,
     long_description=open('README.md').read(),
     
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+from statsmodels.tsa.seasonal import seasonal_decompose
+
+from tsa import ResidualAnomalyScanner
+from tsa._errors import ParameterTypeError
+
+
+def _frame(periods=120, freq='D'):
+    rng = np.random.RandomState(0)
+    index = pd.date_range('2021-01-04', periods=periods, freq=freq)
+    t = np.arange(periods)
+
+    return pd.DataFrame({
+        'a' : np.sin(t * 2 * np.pi / 7) + 0.01 * t + 0.1 * rng.randn(periods),
+        'b' : np.cos(t * 2 * np.pi / 7) + 0.1 * rng.randn(periods),
+        'c' : rng.randn(periods),
+    }, index=index)
+
+
+def test_resid_matches_seasonal_decompose():
+    x = _frame()
+    resid = ResidualAnomalyScanner().resid(x)
+
+    for col in x.columns:
+        expected = seasonal_decompose(x[col], model='additive').resid
+        assert np.allclose(resid[col].values, expected.values, equal_nan=True, atol=1e-10)
+
+
+def test_injected_spike_ranks_first():
+    x = _frame()
+    x.iloc[60, 1] += 10.
+
+    table = ResidualAnomalyScanner().scan(x)
+
+    assert table['series'].iloc[0] == 'b'
+    assert table['timestamp'].iloc[0] == x.index[60]
+
+
+@pytest.mark.parametrize('freq, period', [('D', 7), ('h', 24), ('2h', 12), ('MS', 12),
+                                          ('min', 60), ('15min', 4), ('s', 60)])
+def test_freq_is_inferred(freq, period):
+    x = _frame(periods=60, freq=freq)
+
+    assert ResidualAnomalyScanner()._check_freq(x, None) == period
+    assert ResidualAnomalyScanner().zscore(x).shape == x.shape
+
+
+def test_freq_without_period_must_be_given():
+    x = _frame(periods=20, freq='YS')
+
+    with pytest.raises(ParameterTypeError):
+        ResidualAnomalyScanner().resid(x)
+    assert ResidualAnomalyScanner().resid(x, freq=4).shape == x.shape
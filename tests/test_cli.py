@@ -0,0 +1,101 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from tsa import PanelTimeSeriesExplorer, Regularizer
+from tsa._cli import _read_panel, _build_parser, main
+
+
+def _wide(tmpdir):
+    index = pd.date_range('2021-01-01', periods=120, freq='D')
+    df = pd.DataFrame({
+        'date' : index,
+        'sales' : np.arange(120.),
+        'visits' : np.sin(np.arange(120)),
+        'store' : 'a',
+    }).drop([10, 11, 12, 50])
+    path = os.path.join(str(tmpdir), 'wide.csv')
+    df.to_csv(path, index=False)
+
+    return path, df
+
+
+def test_wide_csv_shares_timestamps_and_keeps_float32(tmpdir):
+    path, df = _wide(tmpdir)
+    args = _build_parser().parse_args([path, '-o', str(tmpdir), '--timestamp', 'date',
+                                       '--chunksize', '25', '--float32'])
+    panel = _read_panel(args)
+
+    assert panel['codes'] is None
+    assert panel['names'] == ['sales', 'visits']
+    assert len(panel['timestamps']) == len(df)
+    assert all(values.dtype == np.float32 and len(values) == len(df) for values in panel['values'])
+
+
+def test_main_writes_stats_profile_and_report(tmpdir):
+    path, df = _wide(tmpdir)
+    out = os.path.join(str(tmpdir), 'out')
+
+    assert main([path, '-o', out, '--timestamp', 'date', '--chunksize', '25', '--max-reports', '1']) == 0
+
+    stats = pd.read_csv(os.path.join(out, 'stats.csv'), index_col='series')
+    profile = pd.read_csv(os.path.join(out, 'profile.csv'), index_col='series')
+
+    assert stats.index.tolist() == ['sales', 'visits']
+    assert stats.loc['sales', 'count'] == len(df)
+    assert os.path.exists(os.path.join(out, 'report_sales.png'))
+
+    regularizer = Regularizer()
+    regularizer.regularize(df.set_index('date')['sales'])
+    expected = regularizer.summary.iloc[0]
+    for col in ('n_obs', 'n_duplicates', 'n_grid', 'n_missing', 'n_gaps', 'longest_gap'):
+        assert profile.loc['sales', col] == expected[col]
+
+
+def test_main_reads_long_parquet(tmpdir):
+    index = pd.date_range('2021-01-01', periods=30, freq='h')
+    df = pd.concat([pd.DataFrame({'id' : name, 'ts' : index, 'y' : np.random.rand(30)}) for name in 'xyz'])
+    path = os.path.join(str(tmpdir), 'long.parquet')
+    df.to_parquet(path)
+    out = os.path.join(str(tmpdir), 'out')
+
+    assert main([path, '-o', out, '--timestamp', 'ts', '--entity', 'id', '--value', 'y',
+                 '--chunksize', '20', '--max-reports', '0']) == 0
+
+    profile = pd.read_csv(os.path.join(out, 'profile.csv'), index_col='series')
+    assert profile.index.tolist() == ['x', 'y', 'z']
+    assert (profile['n_grid'] == 30).all()
+    assert (profile['n_missing'] == 0).all()
+
+
+def test_empty_timestamp_rows_are_dropped(tmpdir, capsys):
+    index = pd.date_range('2021-01-01', periods=50, freq='D')
+    df = pd.DataFrame({'date' : index.strftime('%Y-%m-%d'), 'sales' : np.arange(50.)})
+    df.loc[20, 'date'] = ''
+    path = os.path.join(str(tmpdir), 'blank.csv')
+    df.to_csv(path, index=False)
+    out = os.path.join(str(tmpdir), 'out')
+
+    assert main([path, '-o', out, '--timestamp', 'date', '--chunksize', '15', '--max-reports', '1']) == 0
+    assert 'skipped 1 rows' in capsys.readouterr().out
+
+    profile = pd.read_csv(os.path.join(out, 'profile.csv'), index_col='series')
+    assert profile.loc['sales', 'n_obs'] == 49
+    assert profile.loc['sales', 'n_grid'] == 50
+    assert profile.loc['sales', 'n_missing'] == 1
+    assert os.path.exists(os.path.join(out, 'report_sales.png'))
+
+
+def test_wide_unsorted_timestamps(tmpdir):
+    path, df = _wide(tmpdir)
+    df.sample(frac=1, random_state=0).to_csv(path, index=False)
+    out = os.path.join(str(tmpdir), 'out')
+
+    assert main([path, '-o', out, '--timestamp', 'date', '--max-reports', '0']) == 0
+
+    stats = pd.read_csv(os.path.join(out, 'stats.csv'), index_col='series')
+    expected = PanelTimeSeriesExplorer().summary(
+        pd.DataFrame({'entity_id' : 'sales', 'timestamp' : df['date'], 'value' : df['sales']}))
+    actual = stats.loc['sales', expected.columns].values.astype(float)
+    assert np.allclose(actual, expected.iloc[0].values.astype(float), equal_nan=True)
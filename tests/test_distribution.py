@@ -0,0 +1,77 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import scipy.stats as st
+
+from tsa import DistributionDiagnostics
+
+
+def _frame():
+    rng = np.random.RandomState(0)
+    x = pd.DataFrame({
+        'normal' : rng.randn(200),
+        'skewed' : rng.exponential(size=200),
+        'uniform' : rng.rand(200),
+        'holes' : rng.randn(200) * 3 + 1,
+    })
+    x.loc[rng.choice(200, 40, replace=False), 'holes'] = np.nan
+
+    return x
+
+
+def test_describe_matches_scipy():
+    x = _frame()
+    table = DistributionDiagnostics().describe(x)
+
+    for col in x.columns:
+        v = x[col].dropna().values
+        row = table.loc[col]
+
+        assert row['n'] == len(v)
+        assert np.isclose(row['mean'], v.mean())
+        assert np.isclose(row['std'], v.std(ddof=1))
+        assert np.isclose(row['skew'], st.skew(v))
+        assert np.isclose(row['kurtosis'], st.kurtosis(v))
+        assert np.allclose([row['norm_loc'], row['norm_scale']], st.norm.fit(v))
+
+        slope, intercept, r = st.probplot(v, fit=True)[1]
+        assert np.allclose([row['probplot_slope'], row['probplot_intercept'], row['probplot_r2']],
+                           [slope, intercept, r * r])
+
+        jb = st.jarque_bera(v)
+        assert np.allclose([row['jb_stat'], row['jb_pvalue']], [jb[0], jb[1]])
+
+        ad = st.anderson(v, dist='norm')
+        assert np.isclose(row['ad_stat'], ad.statistic)
+        critical = [row['ad_critical_{:g}'.format(level)] for level in ad.significance_level]
+        assert np.allclose(critical, ad.critical_values)
+
+
+def test_describe_small_and_degenerate_columns():
+    x = pd.DataFrame({
+        'two' : [1., 2.] + [np.nan] * 8,
+        'empty' : [np.nan] * 10,
+        'constant' : np.ones(10),
+    })
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        table = DistributionDiagnostics().describe(x)
+        scipy_skew = st.skew(x['constant'].values)
+
+    assert table['n'].tolist() == [2, 0, 10]
+    assert table.loc[['two', 'empty']].drop(columns='n').isna().all().all()
+
+    constant = table.loc['constant']
+    assert constant['mean'] == 1. and constant['std'] == 0.
+    assert np.isnan(constant['skew']) and np.isnan(scipy_skew)
+    assert np.isnan(constant['ad_stat']) and np.isnan(constant['jb_stat'])
+
+
+def test_describe_accepts_arrays():
+    x = _frame()
+    table = DistributionDiagnostics().describe(x['normal'].values)
+
+    assert list(table.index) == [0]
+    assert np.isclose(table.loc[0, 'skew'], st.skew(x['normal'].values))
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+from tsa import PanelTimeSeriesExplorer
+
+
+def _manual_acf(s, lag):
+    c = s - s.mean()
+    num = np.nansum(c.values[lag:] * c.values[:-lag])
+
+    return num / np.nansum(c.values ** 2)
+
+
+def test_acf_pairs_observations_by_time():
+    rng = np.random.RandomState(0)
+    index = pd.date_range('2021-01-01', periods=200, freq='D')
+    full = {
+        'a' : pd.Series(np.sin(np.arange(200) * 2 * np.pi / 7) + rng.rand(200), index=index),
+        'b' : pd.Series(rng.rand(200), index=index),
+    }
+    observed = {'a' : full['a'].drop(index[[3, 50, 51, 120]]), 'b' : full['b']}
+
+    df = pd.concat([pd.DataFrame({'entity_id' : name, 'timestamp' : s.index, 'value' : s.values})
+                    for name, s in observed.items()], ignore_index=True).sample(frac=1, random_state=0)
+    table = PanelTimeSeriesExplorer().summary(df, lags=(1, 7), weekday=False)
+
+    for name, s in observed.items():
+        grid = s.reindex(index)
+        for lag in (1, 7):
+            assert np.isclose(table.loc[name, 'acf_{}'.format(lag)], _manual_acf(grid, lag))
+
+
+def test_acf_without_pairs_is_nan():
+    df = pd.DataFrame({
+        'entity_id' : ['a', 'a', 'b'],
+        'timestamp' : pd.to_datetime(['2021-01-01', '2021-01-02', '2021-01-01']),
+        'value' : [1., 2., 3.],
+    })
+    table = PanelTimeSeriesExplorer().summary(df, lags=(1, 7), weekday=False)
+
+    assert np.isnan(table.loc['a', 'acf_7'])
+    assert np.isnan(table.loc['b', 'acf_1'])
+    assert np.isclose(table.loc['a', 'acf_1'], -0.5)
+
+
+def test_nat_rows_are_ignored():
+    index = pd.date_range('2021-01-01', periods=60, freq='D')
+    values = np.arange(60.) + np.sin(np.arange(60))
+    df = pd.DataFrame({'entity_id' : 'a', 'timestamp' : index, 'value' : values})
+    dirty = pd.concat([df, pd.DataFrame({'entity_id' : ['a'], 'timestamp' : [pd.NaT], 'value' : [100.]})],
+                      ignore_index=True)
+
+    explorer = PanelTimeSeriesExplorer()
+    expected = explorer.summary(df, gaps=True)
+    table = explorer.summary(dirty, gaps=True)
+
+    pd.testing.assert_frame_equal(table, expected)
+    assert table.loc['a', 'n_grid'] == 60
+    assert table.loc['a', 'n_missing'] == 0
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+from tsa import Regularizer, ResidualAnomalyScanner
+
+
+def test_regular_monthly_series_is_kept():
+    s = pd.Series(np.arange(60.), index=pd.date_range('2015-01-01', periods=60, freq='MS'))
+    regularizer = Regularizer()
+    ts = regularizer.regularize(s)
+
+    assert len(ts) == 60
+    assert (ts.index == s.index).all()
+    assert regularizer.summary['step'].iloc[0] == 'MS'
+    assert regularizer.summary['n_missing'].iloc[0] == 0
+
+
+def test_monthly_gap_stays_on_month_starts():
+    s = pd.Series(np.arange(60.), index=pd.date_range('2015-01-01', periods=60, freq='MS'))
+    s = s.drop(s.index[[5, 6]])
+
+    for regularizer in (Regularizer(), Regularizer(step='MS')):
+        ts = regularizer.regularize(s).to_series()
+        assert len(ts) == 60
+        assert (ts.index.day == 1).all()
+        assert ts.iloc[5:7].tolist() == [5., 6.]
+        assert regularizer.summary['n_missing'].iloc[0] == 2
+
+
+def test_business_days_are_not_filled_on_weekends():
+    s = pd.Series(np.arange(100.), index=pd.bdate_range('2020-01-01', periods=100))
+    regularizer = Regularizer()
+
+    assert len(regularizer.regularize(s)) == 100
+
+    ts = regularizer.regularize(s.drop(s.index[[10, 11, 30]]))
+    assert len(ts) == 100
+    assert (ts.index.weekday < 5).all()
+    assert regularizer.summary['step'].iloc[0] == 'B'
+
+
+def test_daily_grid_keeps_local_midnight_across_dst():
+    index = pd.date_range('2021-02-20', periods=60, freq='D', tz='US/Eastern')
+    s = pd.Series(np.arange(60.), index=index).drop(index[[10, 30]])
+
+    ts = Regularizer().regularize(s)
+
+    assert len(ts) == 60
+    assert (ts.index == index).all()
+
+
+def test_scanner_period_of_monthly_data():
+    index = pd.date_range('2015-01-01', periods=60, freq='MS')
+    x = pd.DataFrame({'a' : np.sin(np.arange(60) * 2 * np.pi / 12)}, index=index).drop(index[[7]])
+    scanner = ResidualAnomalyScanner()
+
+    assert scanner._check_freq(scanner.regularizer.regularize_frame(x), None) == 12
+
+
+def test_plot_all_regularizes_once():
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from tsa import SignleTimeSeriesExplorer
+
+    class CountingRegularizer(Regularizer):
+        calls = 0
+
+        def regularize(self, arr):
+            CountingRegularizer.calls += 1
+            return Regularizer.regularize(self, arr)
+
+    index = pd.date_range('2021-01-01', periods=100, freq='D')
+    s = pd.Series(np.random.RandomState(0).rand(100), index=index).drop(index[[5, 40]])
+
+    fig = SignleTimeSeriesExplorer(regularizer=CountingRegularizer()).plot_all(s)
+    plt.close(fig)
+
+    assert CountingRegularizer.calls == 1
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+from tsa import RollupPyramid
+
+
+def test_dst_fall_back_keeps_repeated_hour():
+    index = pd.date_range('2021-11-06', '2021-11-09', freq='h', tz='US/Eastern')
+    pyramid = RollupPyramid(pd.Series(1., index=index), levels=('hour', 'day', 'week', 'month'))
+
+    hours = pyramid.level('hour')
+    days = pyramid.level('day')
+
+    assert len(hours) == len(index)
+    assert (hours['count'] == 1).all()
+    assert days['count'].tolist() == [24, 25, 24, 1]
+    assert (days.index == pd.DatetimeIndex(['2021-11-06', '2021-11-07', '2021-11-08', '2021-11-09'],
+                                           tz='US/Eastern')).all()
+    assert len(pyramid.query('2021-11-07', '2021-11-07 03:00', level='hour')) == 5
+
+
+def test_dst_spring_forward_day_has_23_hours():
+    index = pd.date_range('2021-03-13', '2021-03-16', freq='15min', tz='US/Eastern')
+    pyramid = RollupPyramid(pd.Series(1., index=index))
+
+    assert pyramid.level('day')['count'].tolist() == [96, 92, 96, 1]
+
+
+def test_levels_match_pandas_groupby():
+    index = pd.date_range('2015-01-01', periods=200000, freq='min')
+    s = pd.Series(np.random.default_rng(0).normal(size=len(index)), index=index)
+    pyramid = RollupPyramid(s)
+
+    for level, rule in [('hour', 'h'), ('day', 'D'), ('month', 'MS')]:
+        expected = s.resample(rule).agg(['sum', 'count', 'min', 'max', 'last'])
+        assert np.allclose(pyramid.level(level)[expected.columns].values, expected.values)
+
+
+def test_append_matches_single_build():
+    index = pd.date_range('2015-01-01', periods=100000, freq='min')
+    s = pd.Series(np.random.default_rng(1).normal(size=len(index)), index=index)
+    s.iloc[::97] = np.nan
+
+    whole = RollupPyramid(s)
+    streamed = RollupPyramid(s.iloc[:10])
+    for start in range(10, len(s), 3333):
+        streamed.append(s.iloc[start:start + 3333])
+
+    for level in whole.levels:
+        assert np.allclose(whole.level(level).values, streamed.level(level).values, equal_nan=True)
+
+
+def test_empty_series_then_append():
+    empty = pd.Series([], index=pd.DatetimeIndex([], tz='US/Eastern'), dtype=np.float64)
+    pyramid = RollupPyramid(empty, levels=('hour', 'day', 'month'))
+
+    assert len(pyramid.level('month')) == 0
+    assert len(pyramid.query('2021-01-01', '2021-02-01')) == 0
+    assert pyramid.select(width=10) == 'hour'
+
+    index = pd.date_range('2021-01-01', periods=48, freq='h', tz='US/Eastern')
+    pyramid.append(pd.Series(1., index=index))
+
+    assert pyramid.level('day')['count'].tolist() == [24, 24]
+    assert pyramid.level('month').index.tz is not None
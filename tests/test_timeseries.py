@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tsa import TimeSeries
+from tsa._errors import IndexTypeError
+
+
+def test_from_series_rejects_nat():
+    s = pd.Series([1., 2., 3.], index=pd.DatetimeIndex(['2020-01-01', None, '2020-01-03']))
+
+    with pytest.raises(IndexTypeError):
+        TimeSeries.from_series(s)
+
+
+def test_series_roundtrip_is_zero_copy():
+    index = pd.date_range('2020-01-01', periods=10, freq='D', unit='ns')
+    s = pd.Series(np.arange(10.), index=index)
+
+    ts = TimeSeries.from_series(s)
+    back = ts.to_series()
+
+    assert np.shares_memory(ts.values, s.values)
+    assert np.shares_memory(back.values, ts.values)
+    assert np.shares_memory(back.index.values, ts.timestamps)
+    assert back.index.equals(index)
+
+
+def test_unsorted_input_is_sorted_once():
+    index = pd.date_range('2020-01-01', periods=5, freq='D')
+    s = pd.Series(np.arange(5.), index=index)[::-1]
+
+    ts = TimeSeries.from_series(s)
+
+    assert (np.diff(ts.timestamps) > 0).all()
+    assert ts.to_series().equals(s.sort_index())
+
+
+def test_numeric_index_is_kept_and_sorted():
+    s = pd.Series([3., 1., 2., 5., 4.], index=[30, 10, 20, 50, 40])
+    ts = TimeSeries.from_series(s)
+
+    assert not ts.is_datetime
+    assert ts.timestamps.tolist() == [10, 20, 30, 40, 50]
+    assert ts.values.tolist() == [1., 2., 3., 4., 5.]
+    assert (ts.to_series() == s.sort_index()).all()
+
+    floats = TimeSeries.from_series(pd.Series([1., 2., 3.], index=[0.5, 0.1, 0.3]))
+    assert floats.timestamps.tolist() == [0.1, 0.3, 0.5]
+    assert floats.values.tolist() == [2., 3., 1.]
+
+    positions = TimeSeries.from_series(pd.Series([1., 2.], index=pd.RangeIndex(10, 12)))
+    assert positions.timestamps.tolist() == [0, 1]
+
+
+def test_numeric_index_is_drawn_against_x_values():
+    import matplotlib
+    matplotlib.use('Agg')
+    from tsa import SignleTimeSeriesExplorer
+
+    s = pd.Series([3., 1., 2., 5., 4.], index=[30, 10, 20, 50, 40])
+    ax = SignleTimeSeriesExplorer().plot(s)
+
+    assert ax.lines[0].get_xdata().tolist() == [10, 20, 30, 40, 50]
@@ -1 +1,7 @@
-from ._explorer import TimeSeriesDataExplorer
+from ._explorer import SignleTimeSeriesExplorer, MultiTimeSeriesExplorer
+from ._anomaly import ResidualAnomalyScanner
+from ._timeseries import TimeSeries
+from ._rollup import RollupPyramid
+from ._regularize import Regularizer
+from ._panel import PanelTimeSeriesExplorer
+from ._distribution import DistributionDiagnostics
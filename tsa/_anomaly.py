@@ -0,0 +1,318 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.tsatools import freq_to_period
+
+from ._errors import IndexTypeError, ParameterTypeError
+from ._explorer import SignleTimeSeriesExplorer
+from ._regularize import Regularizer
+
+
+# 고정 간격 주기의 한 주기 길이 후보 (minute, hour, day, week), epoch ns
+_CYCLES = (60 * 10 ** 9, 60 * 60 * 10 ** 9, 24 * 60 * 60 * 10 ** 9, 7 * 24 * 60 * 60 * 10 ** 9)
+
+
+class ResidualAnomalyScanner(object):
+    ''' a class for scanning many time-series for anomalies at once
+
+    every column of a wide frame is decomposed in the same way as
+    statsmodels.tsa.seasonal.seasonal_decompose(model='additive'),
+    but in vectorized passes over the whole 2D array instead of one call per series.
+    residuals are scored with robust z-scores (median / MAD)
+    '''
+
+    def __init__(self, regularizer=None):
+        '''
+        params
+        ========================================
+        regularizer: Regularizer, default=None
+            puts every column on the same regular grid before the decomposition
+            if None; Regularizer() (inferred step, mean of duplicates, linear fill)
+        '''
+        self.regularizer = Regularizer() if regularizer is None else regularizer
+
+    # main method
+    def scan(self, x, freq=None, threshold=3.5, top_n=10, plot=False, ma_period=5):
+        '''
+        flag anomalous points of every column of x and rank the series by their worst point
+
+        params
+        ========================================
+        x: pandas.DataFrame or 2D array-like
+            one series per column
+        freq: int, default=None
+            seasonal period. if None; inferred from the DatetimeIndex of x
+        threshold: float, default=3.5
+            points with |robust z-score| above threshold are flagged as anomalies
+        top_n: int, default=10
+            number of series to return
+        plot: bool, default=False
+            if True; draw SignleTimeSeriesExplorer.plot_all reports for the returned series only
+        ma_period: int, default=5
+            passed to SignleTimeSeriesExplorer.plot_all
+
+        return
+        =========================================
+        table: pandas.DataFrame
+            one row per series, ranked by the largest |z-score|
+            columns: series, timestamp, value, zscore, n_anomalies
+        '''
+        x = self.regularizer.regularize_frame(self._check_frame(x))
+        z = self._robust_zscore(self._resid(x, freq))
+
+        abs_z = np.abs(z.values)
+        filled = np.where(np.isnan(abs_z), -np.inf, abs_z)
+
+        n_anomalies = (filled > threshold).sum(axis=0)
+        worst_pos = filled.argmax(axis=0)
+        cols = np.arange(x.shape[1])
+        worst_score = filled[worst_pos, cols]
+
+        flagged = np.flatnonzero(n_anomalies > 0)
+        order = flagged[np.argsort(-worst_score[flagged], kind='stable')][:top_n]
+
+        table = pd.DataFrame({
+            'series' : x.columns[order],
+            'timestamp' : x.index[worst_pos[order]],
+            'value' : x.values[worst_pos[order], order],
+            'zscore' : z.values[worst_pos[order], order],
+            'n_anomalies' : n_anomalies[order],
+        })
+        table.index = pd.RangeIndex(1, len(table) + 1, name='rank')
+
+        if plot:
+            self.plot_reports(x, table, ma_period=ma_period)
+
+        return table
+
+    def plot_reports(self, x, table, ma_period=5):
+        '''
+        draw SignleTimeSeriesExplorer.plot_all reports for the series listed in table
+
+        params
+        ========================================
+        x: pandas.DataFrame
+        table: pandas.DataFrame, result of scan
+        ma_period: int, default=5
+
+        return
+        =========================================
+        figs: list of matplotlib.figure.Figure
+        '''
+        explorer = SignleTimeSeriesExplorer()
+
+        return [explorer.plot_all(x[series], ma_period=ma_period) for series in table['series']]
+
+    def flag(self, x, freq=None, threshold=3.5):
+        '''
+        return every anomalous point of x
+
+        params
+        ========================================
+        x: pandas.DataFrame or 2D array-like
+        freq: int, default=None
+        threshold: float, default=3.5
+
+        return
+        =========================================
+        points: pandas.DataFrame
+            columns: series, timestamp, value, zscore
+            sorted by |z-score| in descending order
+        '''
+        x = self.regularizer.regularize_frame(self._check_frame(x))
+        z = self._robust_zscore(self._resid(x, freq)).values
+
+        with np.errstate(invalid='ignore'):
+            rows, cols = np.nonzero(np.abs(z) > threshold)
+
+        points = pd.DataFrame({
+            'series' : x.columns[cols],
+            'timestamp' : x.index[rows],
+            'value' : x.values[rows, cols],
+            'zscore' : z[rows, cols],
+        })
+        order = np.argsort(-np.abs(points['zscore'].values), kind='stable')
+
+        return points.iloc[order].reset_index(drop=True)
+
+    ###########################
+    ###### Decomposition ######
+    ###########################
+
+    def zscore(self, x, freq=None):
+        '''
+        robust z-scores of the decomposition residuals of every column
+
+            z = 0.6745 * (resid - median) / MAD
+
+        when MAD is 0, 1.2533 * mean absolute deviation is used instead (Iglewicz & Hoaglin, 1993)
+
+        params
+        ========================================
+        x: pandas.DataFrame or 2D array-like
+        freq: int, default=None
+
+        return
+        =========================================
+        z: pandas.DataFrame, same shape as the regularized x
+        '''
+        return self._robust_zscore(self.resid(x, freq=freq))
+
+    def resid(self, x, freq=None):
+        '''
+        residuals of the additive decomposition (x - trend - seasonal) of every column
+        x is put on a regular grid by the regularizer first
+
+        params
+        ========================================
+        x: pandas.DataFrame or 2D array-like
+        freq: int, default=None
+
+        return
+        =========================================
+        resid: pandas.DataFrame, same shape as the regularized x
+            NaN at both ends where the centered moving average is not defined
+        '''
+        x = self.regularizer.regularize_frame(self._check_frame(x))
+
+        return self._resid(x, freq)
+
+    # support methods
+    def _robust_zscore(self, resid):
+        ''' residual의 column별 robust z-score를 계산하는 함수 '''
+
+        values = resid.values
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+
+            median = np.nanmedian(values, axis=0)
+            deviation = np.abs(values - median)
+            mad = np.nanmedian(deviation, axis=0)
+            mean_ad = np.nanmean(deviation, axis=0)
+
+            scale = np.where(mad > 0, mad / 0.6745, 1.2533 * mean_ad)
+            scale = np.where(scale > 0, scale, np.nan)
+
+            z = (values - median) / scale
+
+        return pd.DataFrame(z, index=resid.index, columns=resid.columns)
+
+    def _resid(self, x, freq):
+        ''' 일정한 간격의 DataFrame에 대해 additive 분해의 residual을 계산하는 함수 '''
+
+        freq = self._check_freq(x, freq)
+
+        values = x.values.astype(np.float64)
+        detrended = values - self._centered_ma(values, freq)
+        seasonal = self._seasonal(detrended, freq)
+
+        return pd.DataFrame(detrended - seasonal, index=x.index, columns=x.columns)
+
+    def _centered_ma(self, values, freq):
+        ''' 2D array의 각 column에 대해 centered moving average를 계산하는 함수
+        (짝수 주기는 양 끝에 0.5 가중치를 주는 2 x freq MA)
+        '''
+
+        n = len(values)
+        valid = ~np.isnan(values)
+
+        csum = np.zeros((n + 1, values.shape[1]))
+        ccount = np.zeros((n + 1, values.shape[1]))
+        np.cumsum(np.where(valid, values, 0.), axis=0, out=csum[1:])
+        np.cumsum(valid, axis=0, out=ccount[1:])
+
+        trend = np.full(values.shape, np.nan)
+        half = freq // 2
+
+        if freq % 2:
+            if n < freq:
+                return trend
+            window_sum = csum[freq:] - csum[:-freq]
+            window_count = ccount[freq:] - ccount[:-freq]
+            window_sum[window_count < freq] = np.nan
+            trend[half:n - half] = window_sum / freq
+        else:
+            if n < freq + 1:
+                return trend
+            window_sum = csum[freq:] - csum[:-freq]
+            window_count = ccount[freq:] - ccount[:-freq]
+            window_sum[window_count < freq] = np.nan
+            trend[half:n - half] = (window_sum[:-1] + window_sum[1:]) / (2 * freq)
+
+        return trend
+
+    def _seasonal(self, detrended, freq):
+        ''' 주기별 평균으로 seasonal 성분을 계산하는 함수 '''
+
+        n, m = detrended.shape
+        n_period = -(-n // freq)
+
+        padded = np.full((n_period * freq, m), np.nan)
+        padded[:n] = detrended
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+            period_averages = np.nanmean(padded.reshape(n_period, freq, m), axis=0)
+            period_averages -= np.nanmean(period_averages, axis=0)
+
+        return period_averages[np.arange(n) % freq]
+
+    def _check_frame(self, x):
+        ''' 입력값을 pandas.DataFrame으로 변환하는 함수 '''
+
+        if isinstance(x, pd.Series):
+            x = x.to_frame()
+
+        if not isinstance(x, pd.DataFrame):
+            x = pd.DataFrame(x)
+
+        return x
+
+    def _check_freq(self, x, freq):
+        ''' freq가 없으면 DatetimeIndex로부터 주기를 추론하는 함수 '''
+
+        if freq is not None:
+            if not isinstance(freq, (int, np.integer)) or freq < 2:
+                msg = "Parameter Type ERROR: freq must be an integer >= 2, but given {}".format(freq)
+                raise ParameterTypeError(msg)
+            return int(freq)
+
+        if not isinstance(x.index, pd.DatetimeIndex):
+            msg = "Array Index Type ERROR: freq must be given if index is not datetime, but given {}".format(type(x.index))
+            raise IndexTypeError(msg)
+
+        inferred = x.index.freq or pd.infer_freq(x.index)
+        if inferred is None:
+            msg = "Parameter Type ERROR: freq could not be inferred from the index, it must be given"
+            raise ParameterTypeError(msg)
+
+        return self._freq_to_period(pd.tseries.frequencies.to_offset(inferred))
+
+    def _freq_to_period(self, offset):
+        ''' 주기(offset)를 한 주기 안의 관측값 개수로 바꾸는 함수 (multiplier n 포함)
+
+         - 고정 간격: 그 간격으로 나누어떨어지는 다음 단위 (second -> minute, minute -> hour, hour -> day, day -> week)
+         - 달력 주기: statsmodels.tsa.tsatools.freq_to_period / n (B -> 5, W -> 52, MS -> 12, QS -> 4)
+        '''
+
+        try:
+            nanos = offset.nanos
+        except ValueError:
+            nanos = None
+
+        if nanos is not None:
+            for cycle in _CYCLES:
+                if cycle > nanos and cycle % nanos == 0:
+                    return cycle // nanos
+        else:
+            try:
+                period = freq_to_period(offset.base)
+            except ValueError:
+                period = 0
+            if period % offset.n == 0 and period // offset.n >= 2:
+                return period // offset.n
+
+        msg = "Parameter Type ERROR: no seasonal period for frequency {}, freq must be given".format(offset.freqstr)
+        raise ParameterTypeError(msg)
@@ -0,0 +1,323 @@
+import argparse
+import os
+import re
+import sys
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from ._errors import ParameterTypeError
+from ._explorer import SignleTimeSeriesExplorer
+from ._panel import PanelTimeSeriesExplorer
+from ._timeseries import TimeSeries
+
+
+EPILOG = '''
+examples:
+  tsa-explore data.csv -o out --timestamp date --columns sales visits --float32
+  tsa-explore panel.parquet -o out --timestamp ts --entity store_id --value sales --jobs 8
+'''
+
+# profile.csv에 저장할 gap 요약 column
+PROFILE_COLUMNS = ('step', 'count', 'n_duplicates', 'n_grid', 'n_missing', 'n_gaps', 'longest_gap')
+
+
+def main(argv=None):
+    '''
+    tsa-explore console script
+
+    read a CSV or Parquet file in chunks, keep only the selected columns as compact numpy arrays,
+    and write stats.csv (PanelTimeSeriesExplorer.summary), profile.csv (gap summary of every series,
+    computed in the same pass) and plot_all reports to the output directory
+
+    params
+    ===============================
+    argv: list of str, default=None
+        if None; sys.argv[1:]
+
+    return
+    ===============================
+    exit code: int
+    '''
+
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+
+    try:
+        panel = _read_panel(args)
+    except (ImportError, ParameterTypeError, ValueError, KeyError) as e:
+        parser.error(str(e))
+
+    if panel['n_dropped']:
+        print("skipped {} rows with an empty timestamp".format(panel['n_dropped']))
+
+    os.makedirs(args.output, exist_ok=True)
+
+    stats = _write_stats(panel, args)
+    print("wrote statistics of {} series to {}".format(len(stats), args.output))
+
+    if args.max_reports:
+        n_reports = _write_reports(panel, args)
+        print("wrote {} reports to {}".format(n_reports, args.output))
+
+    return 0
+
+
+def _build_parser():
+    ''' argparse parser를 만드는 함수 '''
+
+    parser = argparse.ArgumentParser(
+        prog='tsa-explore',
+        description='explore time-series stored in a CSV or Parquet file',
+        epilog=EPILOG,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+
+    parser.add_argument('path', help='CSV or Parquet file')
+    parser.add_argument('-o', '--output', required=True, help='output directory')
+    parser.add_argument('--format', choices=('csv', 'parquet'), default=None,
+                        help='file format, inferred from the extension by default')
+    parser.add_argument('--timestamp', default='timestamp', help='timestamp column (default: timestamp)')
+    parser.add_argument('--columns', nargs='+', default=None,
+                        help='value columns of a wide table (default: every other numeric column)')
+    parser.add_argument('--entity', default=None,
+                        help='entity id column of a long table, one series per id')
+    parser.add_argument('--value', default='value', help='value column of a long table (default: value)')
+    parser.add_argument('--chunksize', type=int, default=1000000, help='rows per chunk (default: 1000000)')
+    parser.add_argument('--float32', action='store_true', help='store values as float32')
+    parser.add_argument('--lags', type=int, nargs='+', default=[1, 7], help='acf lags (default: 1 7)')
+    parser.add_argument('--max-reports', type=int, default=20,
+                        help='render plot_all reports for at most this many series, 0 to skip (default: 20)')
+    parser.add_argument('--ma-period', type=int, default=5, help='moving average period of the reports')
+    parser.add_argument('--decimate', type=int, default=1,
+                        help='keep every n-th point when rendering reports (statistics use every point)')
+    parser.add_argument('--jobs', type=int, default=1, help='processes used to render reports (default: 1)')
+
+    return parser
+
+
+###########################
+######## Ingestion ########
+###########################
+
+
+def _read_panel(args):
+    '''
+    stream the file chunk by chunk into compact numpy arrays
+
+    a long table (--entity) is kept as one entity code, timestamp and value array.
+    a wide table keeps its timestamp array once, shared by every value column.
+    values are float32 with --float32, float64 otherwise, and are never upcast afterwards
+
+    return
+    ===============================
+    panel: dict
+        codes: int32 array of entity codes (long table) or None (wide table)
+        timestamps: int64 array of epoch nanoseconds
+        values: list of float arrays, one per entity code (wide table) or a single array (long table)
+        names: list of series names indexed by code
+        n_dropped: number of rows dropped for an empty (NaT) timestamp
+    '''
+    dtype = np.float32 if args.float32 else np.float64
+    names = []
+    codes_of = {}
+    codes, timestamps, values = [], [], {}
+    columns = args.columns
+
+    n_dropped = 0
+
+    for chunk in _read_chunks(args):
+        ts = pd.DatetimeIndex(pd.to_datetime(chunk[args.timestamp]))
+        ts = ts.values.astype('datetime64[ns]', copy=False).view(np.int64)
+
+        # timestamp가 비어 있는 행(NaT)은 values, codes와 함께 제외
+        valid = ts != np.iinfo(np.int64).min
+        if not valid.all():
+            n_dropped += int((~valid).sum())
+            chunk, ts = chunk[valid], ts[valid]
+        timestamps.append(ts)
+
+        if args.entity is not None:
+            chunk_codes, chunk_names = pd.factorize(chunk[args.entity])
+            lookup = np.array([_code(codes_of, names, name) for name in chunk_names] + [-1], dtype=np.int32)
+            codes.append(lookup[chunk_codes])
+            values.setdefault(0, []).append(_to_values(chunk[args.value], dtype))
+            continue
+
+        # value column은 첫 chunk에서 한 번 정해 모든 배열의 길이를 timestamp 배열과 맞춤
+        if columns is None:
+            columns = [col for col in chunk.columns
+                       if col != args.timestamp and pd.api.types.is_numeric_dtype(chunk[col])]
+        for col in columns:
+            values.setdefault(_code(codes_of, names, col), []).append(_to_values(chunk[col], dtype))
+
+    if not timestamps or not names:
+        raise ValueError("no rows found in {}".format(args.path))
+
+    timestamps = np.concatenate(timestamps)
+    values = [np.concatenate(values.pop(code)) for code in sorted(values)]
+
+    if args.entity is None:
+        return {'codes' : None, 'timestamps' : timestamps, 'values' : values, 'names' : names,
+                'n_dropped' : n_dropped}
+
+    codes = np.concatenate(codes)
+    keep = codes >= 0
+    if not keep.all():
+        codes, timestamps, values = codes[keep], timestamps[keep], [values[0][keep]]
+
+    return {'codes' : codes, 'timestamps' : timestamps, 'values' : values, 'names' : names,
+            'n_dropped' : n_dropped}
+
+
+def _read_chunks(args):
+    ''' 파일 형식에 맞게 필요한 column만 chunk 단위로 읽는 generator '''
+
+    fmt = args.format or ('parquet' if args.path.lower().endswith(('.parquet', '.pq')) else 'csv')
+
+    if args.entity is not None:
+        usecols = [args.entity, args.timestamp, args.value]
+    elif args.columns is not None:
+        usecols = [args.timestamp] + list(args.columns)
+    else:
+        usecols = None
+
+    if fmt == 'csv':
+        reader = pd.read_csv(args.path, usecols=usecols, chunksize=args.chunksize)
+        for chunk in reader:
+            yield chunk
+        return
+
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("reading Parquet files requires pyarrow, install it with: pip install pyarrow")
+
+    parquet_file = pq.ParquetFile(args.path)
+    for batch in parquet_file.iter_batches(batch_size=args.chunksize, columns=usecols):
+        yield batch.to_pandas()
+
+
+def _code(codes_of, names, name):
+    ''' entity 이름에 전역 code를 부여하는 함수 '''
+
+    if name not in codes_of:
+        codes_of[name] = len(names)
+        names.append(name)
+
+    return codes_of[name]
+
+
+def _to_values(col, dtype):
+    ''' value column을 지정된 float dtype의 numpy 배열로 변환하는 함수 '''
+
+    return pd.to_numeric(col, errors='coerce').to_numpy(dtype=dtype, na_value=np.nan)
+
+
+###########################
+######### Output ##########
+###########################
+
+
+def _write_stats(panel, args):
+    ''' series별 요약 통계(stats.csv)와 gap 요약(profile.csv)을 한 번의 계산으로 저장하는 함수 '''
+
+    explorer = PanelTimeSeriesExplorer()
+    timestamps, names = panel['timestamps'], panel['names']
+
+    if panel['codes'] is not None:
+        table = explorer.summary_arrays(panel['codes'], timestamps, panel['values'][0], names,
+                                        lags=tuple(args.lags), gaps=True)
+    else:
+        # wide table은 공유된 timestamp 배열을 한 번만 정렬하고, 정렬된 column마다 다시 정렬하지 않고 계산
+        order = None
+        if (np.diff(timestamps) < 0).any():
+            order = np.argsort(timestamps, kind='stable')
+            timestamps = timestamps[order]
+        codes = np.zeros(len(timestamps), dtype=np.int64)
+
+        table = pd.concat([explorer.summary_arrays(codes, timestamps, values if order is None else values[order],
+                                                   [name], lags=tuple(args.lags), gaps=True)
+                           for name, values in zip(names, panel['values'])])
+    table.index.name = 'series'
+
+    profile = table[list(PROFILE_COLUMNS)].rename(columns={'count' : 'n_obs'})
+    stats = table.drop(columns=[col for col in PROFILE_COLUMNS if col != 'count'])
+
+    stats.to_csv(os.path.join(args.output, 'stats.csv'))
+    profile.to_csv(os.path.join(args.output, 'profile.csv'))
+
+    return stats
+
+
+def _write_reports(panel, args):
+    ''' series별 plot_all 보고서를 png로 저장하는 함수 (--jobs 개의 process 사용) '''
+
+    names = panel['names']
+    tasks = []
+
+    for code, ts in _iter_series(panel):
+        if len(tasks) >= args.max_reports:
+            break
+        path = os.path.join(args.output, 'report_{}.png'.format(_safe_name(names[code])))
+        step = max(args.decimate, 1)
+        tasks.append((ts.timestamps[::step], ts.values[::step], names[code], path, args.ma_period))
+
+    if args.jobs > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            list(executor.map(_render_report, tasks))
+    else:
+        for task in tasks:
+            _render_report(task)
+
+    return len(tasks)
+
+
+def _render_report(task):
+    ''' 하나의 series에 대해 plot_all 보고서를 그려 저장하는 함수 (worker process에서 실행) '''
+
+    import matplotlib.pyplot as plt
+    plt.switch_backend('Agg')
+
+    timestamps, values, name, path, ma_period = task
+    with warnings.catch_warnings():
+        # Agg backend에서 plt.show()가 내는 경고 무시
+        warnings.simplefilter('ignore', category=UserWarning)
+        fig = SignleTimeSeriesExplorer().plot_all(TimeSeries(timestamps, values, name=name), ma_period=ma_period)
+    fig.savefig(path, bbox_inches='tight')
+    plt.close(fig)
+
+    return path
+
+
+def _iter_series(panel):
+    ''' panel을 series별 (code, TimeSeries)로 나누는 generator (long table은 entity 순 정렬 한 번) '''
+
+    timestamps = panel['timestamps']
+
+    if panel['codes'] is None:
+        for code, values in enumerate(panel['values']):
+            yield code, TimeSeries(timestamps, values, name=code)
+        return
+
+    codes = panel['codes']
+    order = np.argsort(codes, kind='stable')
+    codes = codes[order]
+    timestamps = timestamps[order]
+    values = panel['values'][0][order]
+
+    bounds = np.flatnonzero(np.diff(codes)) + 1
+    for start, end in zip(np.concatenate([[0], bounds]), np.concatenate([bounds, [len(codes)]])):
+        if end > start:
+            yield int(codes[start]), TimeSeries(timestamps[start:end], values[start:end], name=codes[start])
+
+
+def _safe_name(name):
+    ''' 파일 이름으로 쓸 수 없는 문자를 바꾸는 함수 '''
+
+    return re.sub(r'[^0-9A-Za-z_.-]+', '_', str(name))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,177 @@
+import numpy as np
+import pandas as pd
+from scipy.special import log_ndtr, ndtri
+
+from ._errors import ParameterTypeError
+
+
+# scipy.stats.anderson(dist='norm')의 유의수준과 임계값 계수
+AD_SIGNIFICANCE = (15., 10., 5., 2.5, 1.)
+AD_CRITICAL = np.array([0.561, 0.631, 0.752, 0.873, 1.035])
+
+
+class DistributionDiagnostics(object):
+    ''' a class for computing the numbers behind plot_dist and plot_qq for many series at once
+
+    every statistic is computed column-wise on a 2D array in vectorized passes,
+    NaN values of each column are ignored
+    '''
+
+    def __init__(self):
+        pass
+
+    # main method
+    def describe(self, x):
+        '''
+        distribution diagnostics of every column of x
+
+         - n, mean, std (ddof=1)
+         - skew, kurtosis (excess, biased as in scipy.stats.skew / kurtosis)
+         - norm_loc, norm_scale: normal fit of sns.distplot(fit=scipy.stats.norm), as in scipy.stats.norm.fit
+         - probplot_slope, probplot_intercept, probplot_r2: least-squares line of scipy.stats.probplot
+         - jb_stat, jb_pvalue: Jarque-Bera test, as in scipy.stats.jarque_bera
+         - ad_stat, ad_pvalue: Anderson-Darling test for normality, as in scipy.stats.anderson
+           p-value from D'Agostino & Stephens (1986)
+         - ad_critical_{15, 10, 5, 2.5, 1}: critical values of ad_stat at each significance level (%)
+
+        statistics are NaN for columns with fewer than 3 values
+
+        params
+        ========================================
+        x: pandas.DataFrame or 2D array-like
+            one series per column
+
+        return
+        ========================================
+        table: pandas.DataFrame
+            one row per column of x
+        '''
+        values, columns = self._check_2d(x)
+
+        ordered = np.sort(values, axis=0) # NaN은 각 column의 끝으로
+        valid = ~np.isnan(ordered)
+        n = valid.sum(axis=0)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            table = self._moments(ordered, valid, n)
+            slope, intercept, r = self._probplot(ordered, valid, n)
+            ad_stat = self._anderson(ordered, valid, n, table['mean'].values, table['std'].values)
+
+            table['probplot_slope'] = slope
+            table['probplot_intercept'] = intercept
+            table['probplot_r2'] = r * r
+
+            jb_stat = n / 6. * (table['skew'].values ** 2 + table['kurtosis'].values ** 2 / 4.)
+            table['jb_stat'] = jb_stat
+            table['jb_pvalue'] = np.exp(-jb_stat / 2.) # chi2(df=2) 생존함수
+
+            table['ad_stat'] = ad_stat
+            table['ad_pvalue'] = self._anderson_pvalue(ad_stat, n)
+
+            critical = AD_CRITICAL[None, :] / (1 + 0.75 / n + 2.25 / n ** 2)[:, None]
+            for i, level in enumerate(AD_SIGNIFICANCE):
+                table['ad_critical_{:g}'.format(level)] = np.round(critical[:, i], 3)
+
+        table = table.where(pd.Series(n >= 3), axis=0)
+        table['n'] = n
+        table.index = columns
+
+        return table
+
+    # support methods
+    def _moments(self, ordered, valid, n):
+        ''' column별 평균, 표준편차, 왜도, 첨도, 정규분포 적합 모수를 계산하는 함수 '''
+
+        filled = np.where(valid, ordered, 0.)
+        mean = filled.sum(axis=0) / n
+
+        d = np.where(valid, ordered - mean, 0.)
+        d2 = d * d
+        m2 = d2.sum(axis=0) / n
+        m3 = (d2 * d).sum(axis=0) / n
+        m4 = (d2 * d2).sum(axis=0) / n
+
+        return pd.DataFrame({
+            'n' : n,
+            'mean' : mean,
+            'std' : np.sqrt(m2 * n / (n - 1)),
+            'skew' : m3 / m2 ** 1.5,
+            'kurtosis' : m4 / (m2 * m2) - 3.,
+            'norm_loc' : mean,
+            'norm_scale' : np.sqrt(m2),
+        })
+
+    def _probplot(self, ordered, valid, n):
+        ''' Filliben 순서통계량 중앙값에 대한 정렬된 값의 최소제곱 직선을 계산하는 함수 '''
+
+        i = np.arange(1, len(ordered) + 1)[:, None].astype(np.float64)
+
+        # scipy.stats.probplot과 같은 Filliben 근사
+        medians = (i - 0.3175) / (n + 0.365)
+        last = 0.5 ** (1. / n)
+        medians = np.where(i == n, last, medians)
+        medians = np.where(i == 1, 1 - last, medians)
+        osm = np.where(valid, ndtri(np.clip(medians, 0., 1.)), 0.)
+        osr = np.where(valid, ordered, 0.)
+
+        osm_mean = osm.sum(axis=0) / n
+        osr_mean = osr.sum(axis=0) / n
+        dm = np.where(valid, osm - osm_mean, 0.)
+        dr = np.where(valid, osr - osr_mean, 0.)
+
+        sxy = (dm * dr).sum(axis=0)
+        sxx = (dm * dm).sum(axis=0)
+        syy = (dr * dr).sum(axis=0)
+
+        slope = sxy / sxx
+        intercept = osr_mean - slope * osm_mean
+        r = sxy / np.sqrt(sxx * syy)
+
+        return slope, intercept, r
+
+    def _anderson(self, ordered, valid, n, mean, std):
+        ''' 정규분포에 대한 Anderson-Darling 통계량 A^2를 계산하는 함수 '''
+
+        w = (ordered - mean) / std
+        logcdf = log_ndtr(w)
+
+        # i 번째 값과 짝을 이루는 (n + 1 - i) 번째 값의 log 생존함수
+        rows = np.arange(len(ordered))[:, None]
+        mirrored = np.clip(n[None, :] - 1 - rows, 0, None)
+        logsf = log_ndtr(-np.take_along_axis(w, mirrored, axis=0))
+
+        weight = (2. * rows + 1.) / n
+        terms = np.where(valid, weight * (logcdf + logsf), 0.)
+
+        return -n - terms.sum(axis=0)
+
+    def _anderson_pvalue(self, ad_stat, n):
+        ''' D'Agostino & Stephens (1986)의 근사식으로 A^2의 p-value를 계산하는 함수 '''
+
+        a = ad_stat * (1 + 0.75 / n + 2.25 / n ** 2)
+
+        return np.select(
+            [a >= 0.6, a >= 0.34, a >= 0.2],
+            [np.exp(1.2937 - 5.709 * a + 0.0186 * a ** 2),
+             np.exp(0.9177 - 4.279 * a - 1.38 * a ** 2),
+             1 - np.exp(-8.318 + 42.796 * a - 59.938 * a ** 2)],
+            1 - np.exp(-13.436 + 101.14 * a - 223.73 * a ** 2))
+
+    def _check_2d(self, x):
+        ''' 입력값을 2D float64 배열과 column 이름으로 변환하는 함수 '''
+
+        if isinstance(x, pd.Series):
+            x = x.to_frame()
+
+        if isinstance(x, pd.DataFrame):
+            return x.to_numpy(dtype=np.float64, na_value=np.nan), x.columns
+
+        values = np.asarray(x, dtype=np.float64)
+        if values.ndim == 1:
+            values = values[:, None]
+
+        if values.ndim != 2:
+            msg = "Parameter Type ERROR: x must be 1D or 2D, but given shape {}".format(values.shape)
+            raise ParameterTypeError(msg)
+
+        return values, pd.RangeIndex(values.shape[1])
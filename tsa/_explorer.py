@@ -1,4 +1,3 @@
-import datetime
 from datetime import date, timedelta
 
 import numpy as np
@@ -9,12 +8,37 @@ import seaborn as sns
 from statsmodels.graphics.tsaplots import plot_acf, plot_pacf
 
 from ._errors import IndexTypeError, ParameterTypeError
+from ._regularize import Regularizer
+from ._rollup import RollupPyramid
+from ._timeseries import TimeSeries
 
 class SignleTimeSeriesExplorer(object):
     ''' a class for analyzing single time-series data '''
 
-    def __init__(self):
-        pass
+    weekday_dict = {
+        0 : "Monday",
+        1 : "Tuesday",
+        2 : 'Wednesday',
+        3 : "Thursday",
+        4 : 'Friday',
+        5 : 'Satureday',
+        6 : 'Sunday',
+    }
+
+    def __init__(self, dtype=None, regularizer=None):
+        '''
+        params
+        ========================================
+        dtype: numpy.float32 or numpy.float64, default=None
+            dtype of the values stored in TimeSeries
+            if None; float32 input is kept as is, anything else is stored as float64
+        regularizer: Regularizer, default=None
+            puts arr on a regular grid before moving average, ACF and PACF
+            if None; Regularizer() (inferred step, mean of duplicates, linear fill)
+        '''
+        self.dtype = dtype
+        self.regularizer = Regularizer() if regularizer is None else regularizer
+        self._regular = None # 마지막으로 regularizer를 거친 TimeSeries
 
     # main method
     def plot_all(self, arr, ma_period=5):
@@ -31,7 +55,7 @@ class SignleTimeSeriesExplorer(object):
 
         params
         ========================================
-        x: array-like, list or pandas.Series
+        x: array-like, list, pandas.Series or TimeSeries
         ma_period: int, default = 5
             past periods for calculating moving average
 
@@ -51,12 +75,15 @@ class SignleTimeSeriesExplorer(object):
         axes.append(fig.add_subplot(10, 2, 7)) # 5: (5, 1)
         axes.append(fig.add_subplot(10, 2, 8)) # 6: (5, 2)
 
+        arr = self._check_arr(arr)
+        regular = self._check_regular(arr) # moving average, ACF, PACF가 같은 격자를 공유
+
         self.plot(arr, ax=axes[0], title="Time Series", label="Raw") # raw time-series
-        self.plot_ma(arr, period=ma_period, ax=axes[0], title="", label='Moving Average') # moving average
+        self.plot_ma(regular, period=ma_period, ax=axes[0], title="", label='Moving Average') # moving average
         self.plot_dist(arr, ax=axes[1]) # Distplot
         self.plot_qq(arr, ax=axes[2]) # Q-Q
-        self.plot_acf(arr, ax=axes[3]) # ACF
-        self.plot_pacf(arr, ax=axes[4]) # PACF
+        self.plot_acf(regular, ax=axes[3]) # ACF
+        self.plot_pacf(regular, ax=axes[4]) # PACF
         self.plot_violin_weekday(arr, ax=axes[5]) # Violin by weekday groups
         self.plot_strip_day_of_month(arr, ax=axes[6]) # strip plot by day of month groups
 
@@ -74,7 +101,7 @@ class SignleTimeSeriesExplorer(object):
 
         params
         ===============================
-        x: array-like, list or pandas.Series
+        x: array-like, list, pandas.Series or TimeSeries
         ax: matplotlib.axes._subplots.AxesSubplot, default=None
           if None; draw a plot on a new AxesSubplot
         title: str
@@ -86,8 +113,9 @@ class SignleTimeSeriesExplorer(object):
         '''
 
         ax = self._check_ax(ax)
+        arr = self._check_arr(arr)
 
-        ax.plot(arr, label=label)
+        ax.plot(arr.to_series(), label=label)
 
         if title:
             ax.set_title(title, fontsize=15)
@@ -102,7 +130,7 @@ class SignleTimeSeriesExplorer(object):
 
         params
         ===============================
-        x: array-like, list or pandas.Series
+        x: array-like, list, pandas.Series or TimeSeries
         period: int, past period used to calculate moving average
         ax: matplotlib.axes._subplots.AxesSubplot, default=None
           if None; draw a plot on a new AxesSubplot
@@ -115,19 +143,90 @@ class SignleTimeSeriesExplorer(object):
         '''
 
         ax = self._check_ax(ax)
-        ma_arr = arr.rolling(period).mean()
+        ma_arr = self._check_regular(arr).rolling_mean(period)
 
         self.plot(ma_arr, ax, title, label)
 
         return ax
 
+    def plot_rollup(self, pyramid, start=None, end=None, width=1000, stat='mean', ax=None,
+                    title="Time Series", label=''):
+        ''' draw a time-series plot of [start, end] read from the coarsest level of the pyramid
+        that still has at least width buckets, without reading the whole series
+
+        params
+        ===============================
+        pyramid: RollupPyramid
+        start: str, datetime or pandas.Timestamp, default=None
+        end: str, datetime or pandas.Timestamp, default=None
+        width: int, default=1000
+            number of points needed, e.g. the pixel width of the plot
+        stat: str, default='mean'
+            'sum', 'count', 'min', 'max', 'last' or 'mean'
+            if 'mean'; the min-max band of each bucket is also drawn
+        ax: matplotlib.axes._subplots.AxesSubplot, default=None
+          if None; draw a plot on a new AxesSubplot
+        title: str
+        label: str
+
+        return
+        ===============================
+        ax: AxesSubplot
+        '''
+
+        ax = self._check_ax(ax)
+        df = pyramid.query(start, end, width=width)
+
+        if stat == 'mean':
+            ax.fill_between(df.index, df['min'], df['max'], alpha=0.2)
+
+        self.plot(df[stat], ax=ax, title=title, label=label)
+
+        return ax
+
+    def plot_weekly_sum(self, arr, ax=None):
+        '''
+        draw a bar-plot of the weekly sum of given arr (weeks start on Monday)
+
+        params
+        =========================
+        x: pandas.Series, TimeSeries or RollupPyramid
+            the type of given arr index must be Timestamp
+        ax: matplotlib.axes._subplots.AxesSubplot
+            default=None, if None: draw a plot on a new AxesSubplot
+
+        return
+        ===============================
+        ax: AxesSubplot
+        '''
+
+        return self._plot_calendar_sum(arr, 'week', ax=ax, title="Weekly Sum", bar_width=5)
+
+    def plot_monthly_sum(self, arr, ax=None):
+        '''
+        draw a bar-plot of the monthly sum of given arr
+
+        params
+        =========================
+        x: pandas.Series, TimeSeries or RollupPyramid
+            the type of given arr index must be Timestamp
+        ax: matplotlib.axes._subplots.AxesSubplot
+            default=None, if None: draw a plot on a new AxesSubplot
+
+        return
+        ===============================
+        ax: AxesSubplot
+        '''
+
+        return self._plot_calendar_sum(arr, 'month', ax=ax, title="Monthly Sum", bar_width=20)
+
     def plot_dist(self, arr, ax=None):
         '''
         draw a distribution plot of given arr
 
         params
         =========================
-        x: array-like, list or pandas.Series
+        x: array-like, list, pandas.Series or TimeSeries
         ax: matplotlib.axes._subplots.AxesSubplot, default=None
             if None; draw a plot on a new AxesSubplot
 
@@ -138,7 +237,9 @@ class SignleTimeSeriesExplorer(object):
 
         ax = self._check_ax(ax)
 
-        sns.distplot(arr, ax=ax, fit=sp.norm)
+        arr = self._check_arr(arr)
+
+        sns.distplot(arr.values, ax=ax, fit=sp.norm)
         ax.set_title("Data Distribution", fontsize=15)
         ax.set_xlabel("")
 
@@ -150,7 +251,7 @@ class SignleTimeSeriesExplorer(object):
 
         params
         =========================
-        x: array-like, list or pandas.Series
+        x: array-like, list, pandas.Series or TimeSeries
         ax: matplotlib.axes._subplots.AxesSubplot, default=None
             if None; draw a plot on a new AxesSubplot
 
@@ -161,7 +262,9 @@ class SignleTimeSeriesExplorer(object):
 
         ax = self._check_ax(ax)
 
-        plot_acf(arr, ax=ax)
+        arr = self._check_regular(arr)
+
+        plot_acf(arr.values, ax=ax)
         ax.set_title('ACF Plot', fontsize=15)
 
         return ax
@@ -172,7 +275,7 @@ class SignleTimeSeriesExplorer(object):
 
         params
         =========================
-        x: array-like, list or pandas.Series
+        x: array-like, list, pandas.Series or TimeSeries
         ax: matplotlib.axes._subplots.AxesSubplot, default=None
             if None; draw a plot on a new AxesSubplot
 
@@ -183,7 +286,9 @@ class SignleTimeSeriesExplorer(object):
 
         ax = self._check_ax(ax)
 
-        plot_pacf(arr, ax=ax)
+        arr = self._check_regular(arr)
+
+        plot_pacf(arr.values, ax=ax)
         ax.set_title('PACF Plot', fontsize=15)
 
         return ax
@@ -194,7 +299,7 @@ class SignleTimeSeriesExplorer(object):
 
         params
         =========================
-        x: array-like, list or pandas.Series
+        x: array-like, list, pandas.Series or TimeSeries
         ax: matplotlib.axes._subplots.AxesSubplot, default=None
             if None; draw a plot on a new AxesSubplot
 
@@ -205,7 +310,9 @@ class SignleTimeSeriesExplorer(object):
 
         ax = self._check_ax(ax)
 
-        sp.probplot(arr, plot=ax)
+        arr = self._check_arr(arr)
+
+        sp.probplot(arr.values, plot=ax)
         ax.set_title("Q-Q Plot", fontsize=15)
         ax.set_xlabel("")
         ax.set_ylabel("")
@@ -218,7 +325,7 @@ class SignleTimeSeriesExplorer(object):
 
         params
         =========================
-        x: pandas.Series
+        x: pandas.Series or TimeSeries
             the type of given arr index must be Timestamp
         ax: matplotlib.axes._subplots.AxesSubplot
             default=None, if None: draw a plot on a new AxesSubplot
@@ -229,25 +336,13 @@ class SignleTimeSeriesExplorer(object):
         '''
 
         ax = self._check_ax(ax)
-        self._check_arr_index_type(arr)
-
-        dates = list(arr.index)
-        values = list(arr)
-
-        weekday_dict = {
-            0 : "Monday",
-            1 : "Tuesday",
-            2 : 'Wednesday',
-            3 : "Thursday",
-            4 : 'Friday',
-            5 : 'Satureday',
-            6 : 'Sunday',
-        }
-        weekdays = [weekday_dict[t.weekday()] for t in dates]
+        arr = self._check_arr_index_type(arr)
+
+        weekday_names = np.array(list(self.weekday_dict.values()))
 
         df = pd.DataFrame({
-            'value' : values,
-            'weekday' : weekdays
+            'value' : arr.values,
+            'weekday' : weekday_names[arr.weekday()]
         })
 
         sns.violinplot(x='weekday', y='value', data=df, ax=ax, order=list(self.weekday_dict.values()))
@@ -263,7 +358,7 @@ class SignleTimeSeriesExplorer(object):
 
         params
         =========================
-        x: pandas.Series
+        x: pandas.Series or TimeSeries
             the type of given arr index must be Timestamp
         ax: matplotlib.axes._subplots.AxesSubplot
             default=None, if None: draw a plot on a new AxesSubplot
@@ -274,15 +369,11 @@ class SignleTimeSeriesExplorer(object):
         '''
 
         ax = self._check_ax(ax)
-        self._check_arr_index_type(arr)
-
-        dates = list(arr.index)
-        values = list(arr)
-        days = [t.day for t in dates]
+        arr = self._check_arr_index_type(arr)
 
         df = pd.DataFrame({
-            'value' : values,
-            'day' : days
+            'value' : arr.values,
+            'day' : arr.day_of_month()
         })
 
         sns.stripplot(x='day', y='value', data=df, ax=ax)
@@ -300,36 +391,63 @@ class SignleTimeSeriesExplorer(object):
 
         return ax
 
-    def _check_arr_index_type(self, arr):
-        ''' 입력받은 pandas.Series 객체의 index가 Timestamp 자료형인지 확인하는 함수
+    def _plot_calendar_sum(self, arr, level, ax, title, bar_width):
+        ''' RollupPyramid의 주/월 level 합계로 barplot을 그리는 함수 '''
+
+        ax = self._check_ax(ax)
+
+        if not isinstance(arr, RollupPyramid):
+            arr = RollupPyramid(self._check_arr_index_type(arr), levels=('day', level))
+
+        df = arr.level(level)
+
+        ax.bar(df.index, df['sum'].values, width=bar_width)
+        ax.set_title(title, fontsize=15)
+
+        return ax
+
+    def _check_arr(self, arr):
+        ''' 입력값을 TimeSeries로 변환하는 함수 (이미 TimeSeries면 그대로 반환)
 
         params
         ==========================================
-        x: pandas.Series
+        x: array-like, list, pandas.Series or TimeSeries
         '''
 
-        index = arr.index[0]
+        return TimeSeries.from_any(arr, dtype=self.dtype)
 
-        if not (isinstance(index, pd._libs.tslibs.timestamps.Timestamp)
-                or isinstance(index, datetime.datetime)):
+    def _check_regular(self, arr):
+        ''' 입력값을 TimeSeries로 변환하고 regularizer로 일정한 간격의 격자에 올리는 함수
+        (이미 일정한 간격이고 결측이 없으면 그대로 반환)
 
-            msg = "Array Index Type ERROR: Must be datetime or timestamp, but given {}".format(type(index))
-            raise IndexTypeError(msg)
+        params
+        ==========================================
+        x: array-like, list, pandas.Series or TimeSeries
+        '''
 
-    '''
-    def plot_weekly_sum(self, arr, ax=None):
-        #주차별 합을 계산하여 barplot을 그리는 함수
+        arr = self._check_arr(arr)
 
-        ax = self._check_ax(ax)
-        self._check_arr_index_type(arr)
+        # 방금 regularizer를 거친 TimeSeries는 다시 계산하지 않음
+        if arr is not self._regular:
+            self._regular = self.regularizer.regularize(arr)
 
-        weekly_sum_arr = arr.groupby([datetime.date.isocalendar(t)[1] for t in arr.index]).sum()
+        return self._regular
 
-        ax.bar(list(weekly_sum_arr.index), weekly_sum_arr.values)
-        ax.set_title("Weekly Sum", fontsize=15)
+    def _check_arr_index_type(self, arr):
+        ''' 입력값을 TimeSeries로 변환하고, index 전체가 Timestamp 자료형인지 확인하는 함수
 
-        return ax
-    '''
+        params
+        ==========================================
+        x: pandas.Series or TimeSeries
+        '''
+
+        arr = self._check_arr(arr)
+
+        if not arr.is_datetime:
+            msg = "Array Index Type ERROR: Must be datetime or timestamp, but given positional index"
+            raise IndexTypeError(msg)
+
+        return arr
 
 
 class MultiTimeSeriesExplorer(object):
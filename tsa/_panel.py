@@ -0,0 +1,419 @@
+import numpy as np
+import pandas as pd
+
+from ._errors import IndexTypeError, ParameterTypeError
+from ._explorer import SignleTimeSeriesExplorer
+
+
+_DAY = 24 * 60 * 60 * 10 ** 9
+
+
+class PanelTimeSeriesExplorer(object):
+    ''' a class for analyzing long-format panel data (entity_id, timestamp, value)
+
+    per-entity statistics are computed with one sort by (entity, timestamp) and
+    segment-wise reductions (numpy.bincount) over the sorted arrays,
+    without splitting the table into one pandas.Series per entity.
+    quantiles need one more sort by value inside each entity.
+    '''
+
+    def __init__(self, entity='entity_id', timestamp='timestamp', value='value'):
+        '''
+        params
+        ========================================
+        entity: str, default='entity_id'
+            name of the entity id column
+        timestamp: str, default='timestamp'
+            name of the timestamp column, must be datetime
+        value: str, default='value'
+            name of the value column
+        '''
+        self.entity = entity
+        self.timestamp = timestamp
+        self.value = value
+
+    # main methods
+    def summary(self, df, lags=(1, 7), quantiles=(0.25, 0.5, 0.75), weekday=True, gaps=False):
+        '''
+        per-entity summary statistics of a long-format table
+
+         - count, mean, std, min, max, skew, kurtosis (excess, biased as in scipy.stats)
+         - quantiles (linear interpolation as in numpy.quantile)
+         - acf at the given lags, pairing observations that are lag sampling steps apart in time,
+           so missing timestamps do not shift the lags
+           (the step of each entity is the median difference between its timestamps)
+         - mean value per weekday (Monday ~ Sunday)
+         - weekly seasonal strength, max(0, 1 - Var(R) / Var(S + R))
+           after removing a linear trend (Wang, Smith & Hyndman, 2006)
+         - gap summary as in Regularizer.summary, if gaps is True
+           (step, n_duplicates, n_grid, n_missing, n_gaps, longest_gap
+           on the grid of the step between the first and the last observation)
+
+        rows with NaN values or NaT timestamps are ignored
+
+        params
+        ========================================
+        df: pandas.DataFrame
+            long-format table with entity, timestamp and value columns
+        lags: tuple of int, default=(1, 7)
+        quantiles: tuple of float, default=(0.25, 0.5, 0.75)
+        weekday: bool, default=True
+            if True; add weekday profile and seasonal strength
+        gaps: bool, default=False
+            if True; add gap summary
+
+        return
+        ========================================
+        table: pandas.DataFrame
+            one row per entity
+        '''
+        codes, uniques, timestamps, values = self._check_panel(df)
+        if weekday:
+            self._check_datetime(df)
+
+        return self.summary_arrays(codes, timestamps, values, uniques, lags=lags, quantiles=quantiles,
+                                   weekday=weekday, gaps=gaps,
+                                   is_datetime=pd.api.types.is_datetime64_any_dtype(df[self.timestamp]))
+
+    def summary_arrays(self, codes, timestamps, values, uniques, lags=(1, 7), quantiles=(0.25, 0.5, 0.75),
+                       weekday=True, gaps=False, is_datetime=True):
+        '''
+        summary of a panel already held as flat numpy arrays, without building a pandas.DataFrame
+
+        values are not upcast, float32 arrays stay float32
+        and only the temporaries of each reduction are float64.
+        rows already sorted by (code, timestamp) are not sorted again
+
+        params
+        ========================================
+        codes: 1D array of int
+            entity code of every row, 0 <= code < len(uniques)
+        timestamps: 1D array of int64
+            epoch nanoseconds (local time) of every row
+        values: 1D array of float32 or float64
+        uniques: array-like
+            entity name of every code
+        lags, quantiles, weekday, gaps: see summary
+        is_datetime: bool, default=True
+            whether timestamps hold datetimes, used for the step of the gap summary
+
+        return
+        ========================================
+        table: pandas.DataFrame
+            one row per entity
+        '''
+        k = len(uniques)
+
+        keep = ~np.isnan(values)
+        if not keep.all():
+            codes, timestamps, values = codes[keep], timestamps[keep], values[keep]
+
+        # (entity, timestamp) 순으로 한 번 정렬 (이미 정렬되어 있으면 생략)
+        if not self._is_sorted(codes, timestamps):
+            order = np.lexsort((timestamps, codes))
+            codes, timestamps, values = codes[order], timestamps[order], values[order]
+        codes = codes.astype(np.int64, copy=False)
+        starts = np.flatnonzero(np.diff(codes, prepend=-1))
+
+        table = self._moments(codes, values, k)
+        centered = values - table['mean'].values[codes]
+
+        if quantiles:
+            for q, col in zip(quantiles, self._quantiles(codes, values, starts, quantiles, k)):
+                table['q{:g}'.format(q * 100)] = col
+
+        steps = self._steps(codes, timestamps, k)
+        same, jumps = self._jumps(codes, timestamps, steps)
+        for lag in lags:
+            table['acf_{}'.format(lag)] = self._acf(codes, centered, same, jumps, lag, k)
+
+        if weekday:
+            days = timestamps // _DAY
+            weekdays = (days + 3) % 7
+
+            profile = self._weekday_profile(codes, weekdays, values, k)
+            for i, name in SignleTimeSeriesExplorer.weekday_dict.items():
+                table[name] = profile[:, i]
+
+            table['seasonal_strength'] = self._seasonal_strength(codes, days, weekdays, values, starts, k)
+
+        if gaps:
+            table['step'] = pd.to_timedelta(steps, unit='ns') if is_datetime else steps
+            for name, col in self._gaps(codes, same, jumps, table['count'].values, k).items():
+                table[name] = col
+
+        table.index = pd.Index(uniques, name=self.entity)
+
+        return table
+
+    def series(self, df, entity_id):
+        '''
+        a single entity of the table as a pandas.Series indexed by timestamp
+
+        params
+        ========================================
+        df: pandas.DataFrame
+        entity_id: hashable
+
+        return
+        ========================================
+        pandas.Series
+        '''
+        rows = df[df[self.entity] == entity_id]
+
+        if len(rows) == 0:
+            msg = "Parameter Type ERROR: entity_id {} not found in column {}".format(entity_id, self.entity)
+            raise ParameterTypeError(msg)
+
+        return pd.Series(rows[self.value].values, index=pd.DatetimeIndex(rows[self.timestamp]),
+                         name=entity_id).sort_index()
+
+    def plot_report(self, df, entity_id, ma_period=5, explorer=None):
+        '''
+        draw SignleTimeSeriesExplorer.plot_all report of a single entity
+
+        params
+        ========================================
+        df: pandas.DataFrame
+        entity_id: hashable
+        ma_period: int, default=5
+        explorer: SignleTimeSeriesExplorer, default=None
+            if None; SignleTimeSeriesExplorer()
+
+        return
+        ========================================
+        fig: matplotlib.figure.Figure
+        '''
+        if explorer is None:
+            explorer = SignleTimeSeriesExplorer()
+
+        return explorer.plot_all(self.series(df, entity_id), ma_period=ma_period)
+
+    # support methods
+    def _is_sorted(self, codes, timestamps):
+        ''' 배열이 (entity, timestamp) 순으로 정렬되어 있는지 확인하는 함수 '''
+
+        code_diff = np.diff(codes)
+        if (code_diff < 0).any():
+            return False
+
+        return bool(((code_diff > 0) | (np.diff(timestamps) >= 0)).all())
+
+    def _sort_within(self, codes, values):
+        ''' 정렬된 codes의 각 entity 안에서 values를 정렬하는 함수 (entity가 하나면 numpy.sort) '''
+
+        if len(codes) == 0 or codes[0] == codes[-1]:
+            return np.sort(values)
+
+        return values[np.lexsort((values, codes))]
+
+    def _moments(self, codes, values, k):
+        ''' entity별 count, mean, std, min, max, skew, kurtosis를 계산하는 함수 '''
+
+        n = np.bincount(codes, minlength=k).astype(np.float64)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.bincount(codes, values, minlength=k) / n
+            d = values - mean[codes]
+            d2 = d * d
+            m2 = np.bincount(codes, d2, minlength=k) / n
+            m3 = np.bincount(codes, d2 * d, minlength=k) / n
+            m4 = np.bincount(codes, d2 * d2, minlength=k) / n
+
+            minimum = np.full(k, np.inf)
+            maximum = np.full(k, -np.inf)
+            np.minimum.at(minimum, codes, values)
+            np.maximum.at(maximum, codes, values)
+
+            table = pd.DataFrame({
+                'count' : n.astype(np.int64),
+                'mean' : mean,
+                'std' : np.sqrt(m2 * n / (n - 1)),
+                'min' : np.where(n > 0, minimum, np.nan),
+                'max' : np.where(n > 0, maximum, np.nan),
+                'skew' : m3 / m2 ** 1.5,
+                'kurtosis' : m4 / (m2 * m2) - 3,
+            })
+
+        table['std'] = table['std'].where(n > 1)
+
+        return table
+
+    def _quantiles(self, codes, values, starts, quantiles, k):
+        ''' entity 안에서 값을 정렬한 뒤 위치로 분위수를 계산하는 함수 '''
+
+        sorted_values = self._sort_within(codes, values)
+
+        n = np.bincount(codes, minlength=k)
+        present = np.flatnonzero(n)
+        seg_start = np.zeros(k, dtype=np.int64)
+        seg_start[present] = starts
+
+        columns = []
+        for q in quantiles:
+            pos = q * (n - 1)
+            lo = np.floor(pos).astype(np.int64)
+            hi = np.ceil(pos).astype(np.int64)
+            lo_val = sorted_values[np.clip(seg_start + lo, 0, len(values) - 1)] if len(values) else np.zeros(k)
+            hi_val = sorted_values[np.clip(seg_start + hi, 0, len(values) - 1)] if len(values) else np.zeros(k)
+            columns.append(np.where(n > 0, lo_val + (pos - lo) * (hi_val - lo_val), np.nan))
+
+        return columns
+
+    def _steps(self, codes, timestamps, k):
+        ''' entity별 timestamp 간격(0 제외)의 중앙값을 계산하는 함수 (간격이 없으면 1) '''
+
+        diffs = np.diff(timestamps)
+        keep = (codes[1:] == codes[:-1]) & (diffs > 0)
+        diff_codes, diffs = codes[1:][keep], diffs[keep]
+        diffs = self._sort_within(diff_codes, diffs)
+
+        n = np.bincount(diff_codes, minlength=k)
+        present = n > 0
+        steps = np.ones(k, dtype=np.int64)
+        steps[present] = diffs[(np.cumsum(n) - n)[present] + (n[present] - 1) // 2]
+
+        return steps
+
+    def _jumps(self, codes, timestamps, steps):
+        ''' 정렬된 배열에서 같은 entity의 연속된 관측값 사이가 step 몇 개인지 계산하는 함수 '''
+
+        same = codes[1:] == codes[:-1]
+        with np.errstate(invalid='ignore'):
+            jumps = np.rint(np.diff(timestamps) / steps[codes[1:]]).astype(np.int64)
+
+        return same, np.where(same, jumps, 0)
+
+    def _acf(self, codes, centered, same, jumps, lag, k):
+        ''' 같은 entity 안에서 시간상 lag * step 만큼 떨어진 관측값의 자기상관을 계산하는 함수 '''
+
+        if lag < 1:
+            msg = "Parameter Type ERROR: lags must be positive integers, but given {}".format(lag)
+            raise ParameterTypeError(msg)
+
+        if len(codes) == 0:
+            return np.full(k, np.nan)
+
+        if (jumps[same] == 1).all():
+            # 중복과 gap이 없으면 lag 행 뒤의 관측값이 곧 lag step 뒤의 관측값
+            paired = np.flatnonzero(codes[lag:] == codes[:-lag])
+            later = paired + lag
+        else:
+            # 연속된 관측값 사이의 step 수를 누적해 격자 위치를 만들고,
+            # entity 경계에서는 lag + 1 만큼 건너뛰어 다른 entity와 짝지어지지 않게 함
+            slots = np.concatenate([[0], np.cumsum(np.where(same, jumps, lag + 1))])
+
+            later = np.searchsorted(slots, slots + lag)
+            paired = np.flatnonzero(slots[np.minimum(later, len(slots) - 1)] == slots + lag)
+            later = later[paired]
+
+        num = np.bincount(codes[paired], centered[paired] * centered[later], minlength=k)
+        n_pairs = np.bincount(codes[paired], minlength=k)
+        denom = np.bincount(codes, centered * centered, minlength=k)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            acf = num / denom
+
+        return np.where(n_pairs > 0, acf, np.nan)
+
+    def _gaps(self, codes, same, jumps, count, k):
+        ''' entity별 중복, 격자 크기, 결측, gap 개수와 가장 긴 gap을 계산하는 함수 '''
+
+        later = codes[1:]
+        missing = np.maximum(jumps - 1, 0)
+
+        n_duplicates = np.bincount(later[same & (jumps == 0)], minlength=k)
+        n_missing = np.bincount(later, missing, minlength=k).astype(np.int64)
+        longest_gap = np.zeros(k, dtype=np.int64)
+        np.maximum.at(longest_gap, later, missing)
+
+        return {
+            'n_duplicates' : n_duplicates,
+            'n_grid' : count - n_duplicates + n_missing,
+            'n_missing' : n_missing,
+            'n_gaps' : np.bincount(later[missing > 0], minlength=k),
+            'longest_gap' : longest_gap,
+        }
+
+    def _weekday_profile(self, codes, weekdays, values, k):
+        ''' entity x 요일별 평균을 계산하는 함수 '''
+
+        keys = codes * 7 + weekdays
+        total = np.bincount(keys, values, minlength=k * 7)
+        count = np.bincount(keys, minlength=k * 7)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return (total / count).reshape(k, 7)
+
+    def _seasonal_strength(self, codes, days, weekdays, values, starts, k):
+        ''' 선형 추세를 제거한 뒤 요일 성분의 강도를 계산하는 함수 '''
+
+        n = np.bincount(codes, minlength=k).astype(np.float64)
+        first_day = np.zeros(k, dtype=np.int64)
+        first_day[np.flatnonzero(n)] = days[starts]
+        t = (days - first_day[codes]).astype(np.float64)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            t_mean = np.bincount(codes, t, minlength=k) / n
+            x_mean = np.bincount(codes, values, minlength=k) / n
+            dt = t - t_mean[codes]
+            dx = values - x_mean[codes]
+            slope = np.bincount(codes, dt * dx, minlength=k) / np.bincount(codes, dt * dt, minlength=k)
+            slope = np.where(np.isfinite(slope), slope, 0.)
+
+            detrended = dx - slope[codes] * dt
+            seasonal = self._weekday_profile(codes, weekdays, detrended, k)[codes, weekdays]
+            remainder = detrended - seasonal
+
+            var_detrended = np.bincount(codes, detrended * detrended, minlength=k)
+            var_remainder = np.bincount(codes, remainder * remainder, minlength=k)
+            strength = np.maximum(0., 1 - var_remainder / var_detrended)
+
+        return np.where(n > 7, strength, np.nan)
+
+    def _check_panel(self, df):
+        ''' long-format 표에서 entity code, epoch ns, value 배열을 꺼내는 함수
+        (entity가 없거나 timestamp가 NaT인 행은 제외, float32 값은 그대로 유지) '''
+
+        missing = [col for col in (self.entity, self.timestamp, self.value) if col not in df.columns]
+        if missing:
+            msg = "Parameter Type ERROR: df must have columns {}, but {} not found".format(
+                (self.entity, self.timestamp, self.value), missing)
+            raise ParameterTypeError(msg)
+
+        codes, uniques = pd.factorize(df[self.entity])
+        timestamps = self._timestamps(df)
+
+        values = df[self.value].to_numpy()
+        if values.dtype != np.float32:
+            values = df[self.value].to_numpy(dtype=np.float64, na_value=np.nan)
+
+        keep = codes >= 0
+        if pd.api.types.is_datetime64_any_dtype(df[self.timestamp]):
+            # NaT는 int64 최솟값으로 변환되므로 NaN 값과 같이 제외
+            keep &= timestamps != np.iinfo(np.int64).min
+        if not keep.all():
+            codes, timestamps, values = codes[keep], timestamps[keep], values[keep]
+
+        return codes, uniques, timestamps, values
+
+    def _timestamps(self, df):
+        ''' timestamp column을 int64 배열로 변환하는 함수 (datetime은 현지 시각 기준 epoch ns) '''
+
+        col = df[self.timestamp]
+
+        if pd.api.types.is_datetime64_any_dtype(col):
+            index = pd.DatetimeIndex(col)
+            if index.tz is not None:
+                index = index.tz_localize(None)
+            return index.values.astype('datetime64[ns]', copy=False).view(np.int64)
+
+        return col.to_numpy(dtype=np.int64)
+
+    def _check_datetime(self, df):
+        ''' timestamp column이 datetime인지 확인하는 함수 '''
+
+        if not pd.api.types.is_datetime64_any_dtype(df[self.timestamp]):
+            msg = "Array Index Type ERROR: {} must be datetime for weekday statistics, but given {}".format(
+                self.timestamp, df[self.timestamp].dtype)
+            raise IndexTypeError(msg)
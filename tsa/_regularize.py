@@ -0,0 +1,389 @@
+import numpy as np
+import pandas as pd
+
+from ._errors import ParameterTypeError
+from ._timeseries import TimeSeries
+
+
+_DAY = 24 * 60 * 60 * 10 ** 9
+
+
+AGGS = ('mean', 'sum', 'min', 'max', 'first', 'last')
+FILLS = ('linear', 'ffill', 'zero', 'nan')
+
+
+class Regularizer(object):
+    ''' a class for putting irregular time-series on a regular grid before analysis
+
+     - infers the sampling step, including calendar frequencies such as MS or B
+     - snaps every timestamp to the nearest grid point (or the start of its calendar period)
+     - aggregates values falling on the same grid point (duplicates)
+     - fills grid points without a value (gaps) by the given policy
+
+    every step runs in vectorized numpy passes over one series or all columns of a wide frame.
+    a gap summary of the last call is kept in the summary attribute.
+    '''
+
+    def __init__(self, step=None, agg='mean', fill='linear'):
+        '''
+        params
+        ========================================
+        step: str, pandas.Timedelta, pandas.DateOffset or int, default=None
+            sampling step, e.g. 'D', '1h', 'MS', 'B' or nanoseconds
+            if None; inferred from the timestamps (see infer_step)
+        agg: str, default='mean'
+            'mean', 'sum', 'min', 'max', 'first' or 'last'
+            how to aggregate values falling on the same grid point
+        fill: str, default='linear'
+            'linear', 'ffill', 'zero' or 'nan'
+            how to fill grid points without a value
+        '''
+        self.step = step
+        self.agg = self._check_choice('agg', agg, AGGS)
+        self.fill = self._check_choice('fill', fill, FILLS)
+        self.summary = None
+
+    # main methods
+    def regularize(self, arr):
+        '''
+        put a single series on a regular grid
+        a series that is already regular without missing values is returned as is
+        values still missing at both ends after filling are trimmed
+
+        params
+        ========================================
+        arr: array-like, list, pandas.Series or TimeSeries
+
+        return
+        ========================================
+        TimeSeries
+        '''
+        arr = TimeSeries.from_any(arr)
+
+        if len(arr) == 0:
+            self.summary = self._summary([arr.name], 1, arr.is_datetime, 0, 0, 0, 0, 0, 0)
+            return arr
+
+        grid, values, self.summary, regular = self._regularize(arr.timestamps, arr.values[:, None], [arr.name],
+                                                               arr.tz, arr.is_datetime)
+        if regular:
+            return arr
+
+        values = values[:, 0]
+
+        valid = np.flatnonzero(~np.isnan(values))
+        if len(valid) == 0:
+            valid = np.array([0])
+        sl = slice(valid[0], valid[-1] + 1)
+
+        return TimeSeries(grid[sl], values[sl].astype(arr.values.dtype, copy=False), name=arr.name,
+                          tz=arr.tz, is_datetime=arr.is_datetime)
+
+    def regularize_frame(self, x):
+        '''
+        put every column of a wide frame on the same regular grid
+        a frame that is already regular without missing values keeps its index
+
+        params
+        ========================================
+        x: pandas.DataFrame
+            one series per column, the index may be unsorted and contain duplicates
+
+        return
+        ========================================
+        df: pandas.DataFrame
+        '''
+        if not isinstance(x, pd.DataFrame):
+            x = pd.DataFrame(x)
+
+        # 위치값을 values로 하는 TimeSeries로 index를 한 번에 변환, 정렬
+        index = TimeSeries.from_series(pd.Series(np.arange(len(x), dtype=np.float64), index=x.index))
+        order = index.values.astype(np.int64)
+
+        if len(x) == 0:
+            self.summary = self._summary(x.columns, 1, index.is_datetime, 0, 0, 0, 0, 0, 0)
+            return x
+
+        values = x.values.astype(np.float64)[order]
+        grid, values, self.summary, regular = self._regularize(index.timestamps, values, x.columns,
+                                                               index.tz, index.is_datetime)
+        if regular:
+            return x.iloc[order]
+
+        grid_index = TimeSeries(grid, np.zeros(len(grid)), tz=index.tz, is_datetime=index.is_datetime).index
+
+        return pd.DataFrame(values, index=grid_index, columns=x.columns)
+
+    def infer_step(self, timestamps, tz=None, is_datetime=True):
+        '''
+        infer the sampling step of sorted timestamps
+
+         - the frequency recognised by pandas.infer_freq, if the timestamps are regular
+         - a calendar frequency (business day, month, quarter, year) every timestamp falls on
+         - otherwise, the median of the positive differences between timestamps
+
+        params
+        ========================================
+        timestamps: numpy.ndarray of int64 (or float64), sorted
+            epoch nanoseconds (UTC) if is_datetime, otherwise numeric x-values or positions
+        tz: str or tzinfo, default=None
+            timezone of the timestamps, calendar frequencies are checked in local time
+        is_datetime: bool, default=True
+
+        return
+        ========================================
+        step: int, in the unit of timestamps (nanoseconds for datetimes, float for float x-values)
+            or pandas.DateOffset for calendar frequencies
+        '''
+        if self.step is not None:
+            return self._check_step(self.step)
+
+        unique = timestamps[np.concatenate([[True], np.diff(timestamps) > 0])]
+        if len(unique) < 2:
+            return 1
+
+        if is_datetime:
+            index = self._local_index(unique, tz)
+            if len(unique) >= 3:
+                try:
+                    freq = pd.infer_freq(index)
+                except (TypeError, ValueError):
+                    freq = None
+                if freq is not None:
+                    return self._check_step(freq)
+
+        median = np.median(np.diff(unique))
+        if unique.dtype == np.int64:
+            median = int(median)
+
+        if is_datetime:
+            for offset in self._calendar_candidates(median):
+                grid = pd.date_range(offset.rollback(index[0]), index[-1], freq=offset)
+                if index.isin(grid).all():
+                    return offset
+
+        return median
+
+    # support methods
+    def _regularize(self, timestamps, values, names, tz, is_datetime):
+        ''' 정렬된 timestamps와 2D values를 격자에 올리고 집계, 채우기, 요약을 계산하는 함수
+        이미 격자와 같고 결측이 없으면 regular=True
+        '''
+
+        step = self.infer_step(timestamps, tz=tz, is_datetime=is_datetime)
+        grid, slots = self._grid(timestamps, step, tz, is_datetime)
+        n_grid = len(grid)
+
+        starts = np.concatenate([[0], np.flatnonzero(slots[1:] != slots[:-1]) + 1])
+        aggregated = self._aggregate(values, starts)
+
+        grid_values = np.full((n_grid, values.shape[1]), np.nan)
+        grid_values[slots[starts]] = aggregated
+
+        missing = np.isnan(grid_values)
+        filled = self._fill(grid_values, missing)
+
+        observed = (~np.isnan(values)).sum(axis=0)
+        occupied = (~np.isnan(aggregated)).sum(axis=0)
+        n_gaps, longest = self._gap_runs(missing)
+
+        summary = self._summary(names, step, is_datetime, observed, observed - occupied, n_grid,
+                                missing.sum(axis=0), n_gaps, longest)
+        regular = n_grid == len(timestamps) == len(starts) and not missing.any()
+
+        return grid, filled, summary, regular
+
+    def _grid(self, timestamps, step, tz, is_datetime):
+        ''' step에 맞는 격자(UTC epoch ns)와 각 timestamp가 속하는 격자 위치를 계산하는 함수
+
+         - 달력 주기(DateOffset): pandas.date_range로 만든 격자에서, 각 값은 자신이 속한 구간의 시작점으로
+         - 하루 이상의 고정 주기 + timezone: 현지 시각 기준 격자 (DST 이후에도 현지 자정 유지)
+         - 그 외: 첫 timestamp부터 step 간격의 격자에서, 각 값은 가장 가까운 격자점으로
+        '''
+
+        if isinstance(step, pd.DateOffset):
+            index = self._local_index(timestamps, tz)
+            grid = self._utc_ns(pd.date_range(step.rollback(index[0]), index[-1], freq=step))
+            return grid, np.searchsorted(grid, timestamps, side='right') - 1
+
+        if is_datetime and tz is not None and step >= _DAY:
+            local = self._local_index(timestamps, tz).tz_localize(None)
+            local = local.values.astype('datetime64[ns]', copy=False).view(np.int64)
+            slots = (local - local[0] + step // 2) // step
+            grid_local = pd.DatetimeIndex((local[0] + np.arange(slots[-1] + 1, dtype=np.int64) * step).view('datetime64[ns]'))
+            grid_index = grid_local.tz_localize(tz, ambiguous=np.ones(len(grid_local), dtype=bool),
+                                                nonexistent='shift_forward')
+            return self._utc_ns(grid_index), slots
+
+        origin = timestamps[0]
+        if timestamps.dtype == np.float64:
+            # 실수 x-value는 나눗셈 오차를 피하려고 반올림
+            slots = np.rint((timestamps - origin) / step).astype(np.int64)
+        else:
+            slots = (timestamps - origin + step // 2) // step
+
+        return origin + np.arange(slots[-1] + 1, dtype=np.int64) * step, slots
+
+    def _calendar_candidates(self, median):
+        ''' 간격의 중앙값에 맞는 달력 주기 후보를 반환하는 함수 '''
+
+        days = median / _DAY
+
+        if days == 1:
+            return [pd.offsets.BusinessDay()]
+        if 27 <= days <= 32:
+            return [pd.offsets.MonthBegin(), pd.offsets.MonthEnd()]
+        if 88 <= days <= 93:
+            return [pd.offsets.QuarterBegin(startingMonth=1), pd.offsets.QuarterEnd(startingMonth=3)]
+        if 364 <= days <= 367:
+            return [pd.offsets.YearBegin(), pd.offsets.YearEnd()]
+
+        return []
+
+    def _local_index(self, timestamps, tz):
+        ''' UTC epoch ns를 (timezone이 있으면 현지 시각의) DatetimeIndex로 바꾸는 함수 '''
+
+        index = pd.DatetimeIndex(timestamps.view('datetime64[ns]'))
+        if tz is not None:
+            index = index.tz_localize('UTC').tz_convert(tz)
+
+        return index
+
+    def _utc_ns(self, index):
+        ''' DatetimeIndex를 UTC epoch ns 배열로 바꾸는 함수 '''
+
+        if index.tz is not None:
+            index = index.tz_convert('UTC').tz_localize(None)
+
+        return index.values.astype('datetime64[ns]', copy=False).view(np.int64)
+
+    def _aggregate(self, values, starts):
+        ''' 같은 격자점에 떨어진 값들을 agg 방식으로 집계하는 함수 '''
+
+        valid = ~np.isnan(values)
+
+        if self.agg in ('mean', 'sum'):
+            total = np.add.reduceat(np.where(valid, values, 0.), starts, axis=0)
+            count = np.add.reduceat(valid.astype(np.int64), starts, axis=0)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                result = total / count if self.agg == 'mean' else total
+            return np.where(count > 0, result, np.nan)
+
+        if self.agg == 'min':
+            return np.fmin.reduceat(values, starts, axis=0)
+
+        if self.agg == 'max':
+            return np.fmax.reduceat(values, starts, axis=0)
+
+        positions = np.arange(len(values))[:, None]
+        if self.agg == 'first':
+            pos = np.minimum.reduceat(np.where(valid, positions, len(values)), starts, axis=0)
+        else:
+            pos = np.maximum.reduceat(np.where(valid, positions, -1), starts, axis=0)
+
+        found = (pos >= 0) & (pos < len(values))
+        picked = np.take_along_axis(values, np.clip(pos, 0, len(values) - 1), axis=0)
+
+        return np.where(found, picked, np.nan)
+
+    def _fill(self, values, missing):
+        ''' 빈 격자점을 fill 방식으로 채우는 함수 (linear, ffill은 앞/뒤 끝의 결측을 그대로 둠) '''
+
+        if self.fill == 'nan' or not missing.any():
+            return values
+
+        if self.fill == 'zero':
+            return np.where(missing, 0., values)
+
+        n = len(values)
+        positions = np.arange(n)[:, None]
+
+        prev_pos = np.maximum.accumulate(np.where(missing, -1, positions), axis=0)
+        prev_val = np.take_along_axis(values, np.maximum(prev_pos, 0), axis=0)
+        prev_val[prev_pos < 0] = np.nan
+
+        if self.fill == 'ffill':
+            return prev_val
+
+        next_pos = np.minimum.accumulate(np.where(missing, n, positions)[::-1], axis=0)[::-1]
+        next_val = np.take_along_axis(values, np.minimum(next_pos, n - 1), axis=0)
+        next_val[next_pos >= n] = np.nan
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weight = (positions - prev_pos) / (next_pos - prev_pos)
+            interpolated = prev_val + weight * (next_val - prev_val)
+
+        return np.where(missing, interpolated, values)
+
+    def _gap_runs(self, missing):
+        ''' column별 결측 구간의 개수와 가장 긴 결측 구간의 길이를 계산하는 함수 '''
+
+        n, m = missing.shape
+
+        # column 사이에 False를 끼워 넣고 펼쳐서, 구간이 column을 넘지 않도록 함
+        padded = np.zeros((m, n + 2), dtype=np.int8)
+        padded[:, 1:-1] = missing.T
+        edges = np.diff(padded.ravel())
+
+        run_starts = np.flatnonzero(edges == 1)
+        run_ends = np.flatnonzero(edges == -1)
+        columns = run_starts // (n + 2)
+
+        n_gaps = np.bincount(columns, minlength=m)
+        longest = np.zeros(m, dtype=np.int64)
+        np.maximum.at(longest, columns, run_ends - run_starts)
+
+        return n_gaps, longest
+
+    def _summary(self, names, step, is_datetime, n_obs, n_duplicates, n_grid, n_missing, n_gaps, longest_gap):
+        ''' series별 gap 요약 표를 만드는 함수 '''
+
+        return pd.DataFrame({
+            'step' : self._format_step(step, is_datetime),
+            'n_obs' : n_obs,
+            'n_duplicates' : n_duplicates,
+            'n_grid' : n_grid,
+            'n_missing' : n_missing,
+            'n_gaps' : n_gaps,
+            'longest_gap' : longest_gap,
+        }, index=pd.Index(names, name='series'))
+
+    def _format_step(self, step, is_datetime):
+        ''' 요약 표에 보여줄 step을 만드는 함수 '''
+
+        if isinstance(step, pd.DateOffset):
+            return step.freqstr
+
+        return pd.Timedelta(step, unit='ns') if is_datetime else step
+
+    def _check_step(self, step):
+        ''' step을 nanosecond(또는 위치) 단위의 정수, 또는 달력 주기의 DateOffset으로 변환하는 함수 '''
+
+        if isinstance(step, (int, np.integer)):
+            if step > 0:
+                return int(step)
+            offset = None
+        else:
+            try:
+                offset = pd.tseries.frequencies.to_offset(step)
+            except (TypeError, ValueError):
+                offset = None
+
+        if offset is None or offset.n <= 0:
+            msg = "Parameter Type ERROR: step must be a positive frequency, but given {}".format(step)
+            raise ParameterTypeError(msg)
+
+        try:
+            return offset.nanos
+        except ValueError:
+            # MS, B 같은 달력 주기는 고정된 길이가 없음
+            return offset
+
+    def _check_choice(self, name, value, choices):
+        ''' 파라미터가 허용된 값 중 하나인지 확인하는 함수 '''
+
+        if value not in choices:
+            msg = "Parameter Type ERROR: {} must be one of {}, but given {}".format(name, choices, value)
+            raise ParameterTypeError(msg)
+
+        return value
@@ -0,0 +1,378 @@
+import numpy as np
+import pandas as pd
+
+from ._errors import IndexTypeError, ParameterTypeError
+from ._timeseries import TimeSeries
+
+
+_MINUTE = 60 * 10 ** 9
+_HOUR = 60 * _MINUTE
+_DAY = 24 * _HOUR
+
+LEVELS = ('minute', 'hour', 'day', 'week', 'month')
+SUBDAY_LEVELS = ('minute', 'hour')
+STATS = ('sum', 'count', 'min', 'max', 'last')
+
+
+class RollupPyramid(object):
+    ''' a multi-resolution rollup of a single time-series
+
+    every level stores sum, count, min, max and last of the values in each calendar bucket
+    (minute -> hour -> day -> week -> month). the first level is aggregated from the raw values
+    and every other level from the level below it (months skip weeks), so the whole pyramid
+    is built in one pass. weeks start on Monday.
+
+    minute and hour buckets are cut in UTC, so repeated or skipped hours around DST changes
+    stay separate buckets. day, week and month buckets follow the local calendar of the index.
+    every level keeps growable buffers, so append only writes the tail of each level.
+
+    plotting a time range then only needs to read the coarsest level
+    that still has enough buckets for the requested width.
+    '''
+
+    def __init__(self, arr, levels=LEVELS):
+        '''
+        params
+        ========================================
+        arr: pandas.Series or TimeSeries
+            the type of given arr index must be Timestamp
+        levels: tuple of str, default=('minute', 'hour', 'day', 'week', 'month')
+            subset of the default levels, from fine to coarse
+            e.g. ('day', 'week', 'month') for daily data
+        '''
+        self.levels = self._check_levels(levels)
+        self.tz = None
+        self.last_timestamp = None
+        # 빈 series로 만들어도 level, query가 동작하도록 모든 level을 빈 buffer로 시작
+        self._data = {level : self._empty() for level in self.levels}
+        self._size = {level : 0 for level in self.levels}
+
+        self.append(arr)
+
+    # main methods
+    def append(self, arr):
+        '''
+        add new values to the pyramid
+        only the last bucket of each level is updated, the rest are appended
+
+        params
+        ========================================
+        arr: pandas.Series or TimeSeries
+            every timestamp must be later than or equal to the last timestamp already added
+        '''
+        arr = TimeSeries.from_any(arr)
+
+        if not arr.is_datetime:
+            msg = "Array Index Type ERROR: Must be datetime or timestamp, but given positional index"
+            raise IndexTypeError(msg)
+
+        if self.last_timestamp is None:
+            self.tz = arr.tz
+
+        if len(arr) == 0:
+            return self
+
+        if self.last_timestamp is not None and arr.timestamps[0] < self.last_timestamp:
+            msg = "Array Index Type ERROR: appended timestamps must start at or after {}".format(
+                pd.Timestamp(self.last_timestamp))
+            raise IndexTypeError(msg)
+
+        self.last_timestamp = arr.timestamps[-1]
+
+        new = self._build(arr.timestamps, arr.values.astype(np.float64))
+        for level in self.levels:
+            self._merge(level, new[level])
+
+        return self
+
+    def level(self, level):
+        '''
+        aggregates of the given level
+
+        params
+        ========================================
+        level: str, one of levels
+
+        return
+        ========================================
+        df: pandas.DataFrame
+            columns: sum, count, min, max, last, mean
+            index: start of each bucket
+        '''
+        self._check_level(level)
+
+        return self._to_frame(level, slice(None))
+
+    def select(self, start=None, end=None, width=1000):
+        '''
+        choose the coarsest level that has at least width buckets in [start, end]
+
+        if no level has enough buckets, the finest level is chosen
+
+        params
+        ========================================
+        start: str, datetime or pandas.Timestamp, default=None
+        end: str, datetime or pandas.Timestamp, default=None
+        width: int, default=1000
+            number of points needed, e.g. the pixel width of the plot
+
+        return
+        ========================================
+        level: str
+        '''
+        for level in reversed(self.levels):
+            lo, hi = self._range(level, start, end)
+            if hi - lo >= width:
+                return level
+
+        return self.levels[0]
+
+    def query(self, start=None, end=None, width=1000, level=None):
+        '''
+        aggregates of [start, end] read from a single level
+
+        params
+        ========================================
+        start: str, datetime or pandas.Timestamp, default=None
+        end: str, datetime or pandas.Timestamp, default=None
+        width: int, default=1000
+        level: str, default=None
+            if None; chosen by select(start, end, width)
+
+        return
+        ========================================
+        df: pandas.DataFrame
+            columns: sum, count, min, max, last, mean
+            index: start of each bucket
+        '''
+        if level is None:
+            level = self.select(start, end, width)
+        self._check_level(level)
+
+        lo, hi = self._range(level, start, end)
+
+        return self._to_frame(level, slice(lo, hi))
+
+    # support methods
+    def _build(self, timestamps, values):
+        ''' 정렬된 raw 값으로부터 모든 level의 집계를 계산하는 함수 '''
+
+        valid = ~np.isnan(values)
+
+        raw = {
+            'time' : timestamps,
+            'sum' : np.where(valid, values, 0.),
+            'count' : valid.astype(np.int64),
+            'min' : values,
+            'max' : values,
+            'last' : values,
+        }
+        built = {}
+
+        for i, level in enumerate(self.levels):
+            child_level = self._child(i)
+            child = raw if child_level is None else built[child_level]
+
+            # 하위 집계가 UTC 기준이면 현지 달력 bucket을 위해 현지 시각으로 변환
+            times = child['time']
+            if self._is_local(level) and (child_level is None or not self._is_local(child_level)):
+                times = self._local_ns(times)
+
+            built[level] = self._rollup(child, times, level)
+
+        return built
+
+    def _child(self, i):
+        ''' i 번째 level을 집계할 하위 level을 고르는 함수 (None이면 raw 값에서 집계) '''
+
+        level = self.levels[i]
+
+        for child in reversed(self.levels[:i]):
+            # 주(week)는 월(month) 경계를 넘을 수 있음
+            if child == 'week' and level == 'month':
+                continue
+            # UTC 기준 hour bucket은 30분 단위 offset 지역의 현지 날짜 경계와 맞지 않을 수 있음
+            if child == 'hour' and self._is_local(level) and self.tz is not None:
+                continue
+            return child
+
+        return None
+
+    def _rollup(self, child, times, level):
+        ''' 하위 level(또는 raw 값)의 집계를 상위 level의 bucket으로 다시 집계하는 함수 '''
+
+        keys = self._bucket(times, level)
+        starts = self._starts(keys)
+        last_pos = np.maximum.reduceat(np.where(child['count'] > 0, np.arange(len(keys)), -1), starts)
+
+        return {
+            'time' : keys[starts],
+            'sum' : np.add.reduceat(child['sum'], starts),
+            'count' : np.add.reduceat(child['count'], starts),
+            'min' : np.fmin.reduceat(child['min'], starts),
+            'max' : np.fmax.reduceat(child['max'], starts),
+            'last' : np.where(last_pos >= 0, child['last'][last_pos], np.nan),
+        }
+
+    def _merge(self, level, new):
+        ''' 새 집계를 level의 buffer 끝에 기록하는 함수 (마지막 bucket이 겹치면 합침)
+        buffer가 부족하면 용량을 두 배로 늘리므로, append 비용은 새 값의 길이에 비례
+        '''
+
+        data = self._data[level]
+        size = self._size[level]
+
+        if size and data['time'][size - 1] == new['time'][0]:
+            last = size - 1
+            if new['count'][0] > 0:
+                data['last'][last] = new['last'][0]
+            data['sum'][last] += new['sum'][0]
+            data['count'][last] += new['count'][0]
+            data['min'][last] = np.fmin(data['min'][last], new['min'][0])
+            data['max'][last] = np.fmax(data['max'][last], new['max'][0])
+            new = {stat : arr[1:] for stat, arr in new.items()}
+
+        end = size + len(new['time'])
+
+        if end > len(data['time']):
+            capacity = max(end, 2 * len(data['time']))
+            for stat, arr in data.items():
+                grown = np.empty(capacity, dtype=arr.dtype)
+                grown[:size] = arr[:size]
+                data[stat] = grown
+
+        for stat, arr in new.items():
+            data[stat][size:end] = arr
+
+        self._size[level] = end
+
+    def _empty(self):
+        ''' 비어 있는 level buffer를 만드는 함수 '''
+
+        return {
+            'time' : np.empty(0, dtype=np.int64),
+            'sum' : np.empty(0),
+            'count' : np.empty(0, dtype=np.int64),
+            'min' : np.empty(0),
+            'max' : np.empty(0),
+            'last' : np.empty(0),
+        }
+
+    def _view(self, level):
+        ''' buffer 중 값이 채워진 부분만 반환하는 함수 '''
+
+        size = self._size[level]
+
+        return {stat : arr[:size] for stat, arr in self._data[level].items()}
+
+    def _bucket(self, times, level):
+        ''' epoch ns를 bucket 시작 시각으로 내리는 함수
+        (minute, hour는 UTC 기준, day 이상은 현지 시각 기준 epoch ns를 받음)
+        '''
+
+        if level == 'minute':
+            return times // _MINUTE * _MINUTE
+
+        if level == 'hour':
+            return times // _HOUR * _HOUR
+
+        days = times // _DAY
+
+        if level == 'day':
+            return days * _DAY
+
+        if level == 'week':
+            # 1970-01-01 은 목요일, 그 전 월요일은 -3일
+            return ((days + 3) // 7 * 7 - 3) * _DAY
+
+        months = np.asarray(days).astype('datetime64[D]').astype('datetime64[M]')
+        return months.astype('datetime64[ns]').view(np.int64)
+
+    def _starts(self, keys):
+        ''' 정렬된 bucket key에서 각 bucket의 시작 위치를 찾는 함수 '''
+
+        return np.concatenate([[0], np.flatnonzero(keys[1:] != keys[:-1]) + 1])
+
+    def _range(self, level, start, end):
+        ''' [start, end] 구간에 해당하는 bucket 위치를 찾는 함수 '''
+
+        time = self._view(level)['time']
+        lo = 0 if start is None else np.searchsorted(time, self._bucket(self._to_key(start, level), level), side='left')
+        hi = len(time) if end is None else np.searchsorted(time, self._to_key(end, level), side='right')
+
+        return lo, hi
+
+    def _to_frame(self, level, sl):
+        ''' level의 집계를 pandas.DataFrame으로 변환하는 함수 '''
+
+        data = self._view(level)
+        index = pd.DatetimeIndex(data['time'][sl].view('datetime64[ns]'))
+
+        if self.tz is not None:
+            if self._is_local(level):
+                # 현지 자정이 DST로 두 번 있거나 없는 지역을 위해 ambiguous, nonexistent 지정
+                index = index.tz_localize(self.tz, ambiguous=np.ones(len(index), dtype=bool),
+                                          nonexistent='shift_forward')
+            else:
+                index = index.tz_localize('UTC').tz_convert(self.tz)
+
+        df = pd.DataFrame({stat : data[stat][sl] for stat in STATS}, index=index)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            df['mean'] = np.where(df['count'] > 0, df['sum'] / df['count'], np.nan)
+
+        return df
+
+    def _local_ns(self, timestamps):
+        ''' timezone이 있으면 UTC epoch ns를 현지 시각 기준의 epoch ns로 바꾸는 함수 '''
+
+        if self.tz is None:
+            return timestamps
+
+        index = pd.DatetimeIndex(timestamps.view('datetime64[ns]')).tz_localize('UTC').tz_convert(self.tz)
+        return index.tz_localize(None).values.astype('datetime64[ns]', copy=False).view(np.int64)
+
+    def _to_key(self, t, level):
+        ''' query 경계 시각을 level의 bucket 기준(UTC 또는 현지 시각) epoch ns로 바꾸는 함수
+        timezone이 없는 시각은 index의 현지 시각으로 해석
+        '''
+
+        t = pd.Timestamp(t)
+
+        if self.tz is None:
+            if t.tzinfo is not None:
+                t = t.tz_convert('UTC').tz_localize(None)
+            return np.int64(t.value)
+
+        if self._is_local(level):
+            if t.tzinfo is not None:
+                t = t.tz_convert(self.tz).tz_localize(None)
+            return np.int64(t.value)
+
+        if t.tzinfo is None:
+            t = t.tz_localize(self.tz, ambiguous=True, nonexistent='shift_forward')
+
+        return np.int64(t.value)
+
+    def _is_local(self, level):
+        ''' 현지 달력 기준으로 자르는 level인지 확인하는 함수 '''
+
+        return level not in SUBDAY_LEVELS
+
+    def _check_levels(self, levels):
+        ''' levels가 기본 level의 부분집합이며 fine -> coarse 순서인지 확인하는 함수 '''
+
+        levels = tuple(levels)
+        positions = [LEVELS.index(level) if level in LEVELS else -1 for level in levels]
+
+        if not levels or -1 in positions or positions != sorted(set(positions)):
+            msg = "Parameter Type ERROR: levels must be an ordered subset of {}, but given {}".format(LEVELS, levels)
+            raise ParameterTypeError(msg)
+
+        return levels
+
+    def _check_level(self, level):
+        ''' 존재하는 level인지 확인하는 함수 '''
+
+        if level not in self.levels:
+            msg = "Parameter Type ERROR: level must be one of {}, but given {}".format(self.levels, level)
+            raise ParameterTypeError(msg)
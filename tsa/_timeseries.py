@@ -0,0 +1,262 @@
+import numpy as np
+import pandas as pd
+
+from ._errors import IndexTypeError, ParameterTypeError
+
+
+class TimeSeries(object):
+    ''' a compact columnar container for a single time-series
+
+    timestamps are stored as an int64 array of epoch nanoseconds (UTC)
+    (or the numeric x-values of a non-datetime index) and
+    values as a float64 array (or float32 if asked for).
+    both are sorted by timestamp and checked once on construction,
+    so the explorers do not need to validate or convert again.
+
+    attributes
+    ========================================
+    timestamps: numpy.ndarray of int64 (or float64 x-values)
+        epoch nanoseconds if is_datetime, otherwise numeric x-values or positions
+    values: numpy.ndarray of float64 or float32
+    name: hashable
+    tz: str or tzinfo, timezone of the original index
+    is_datetime: bool, whether timestamps hold datetimes
+    '''
+
+    __slots__ = ('timestamps', 'values', 'name', 'tz', 'is_datetime')
+
+    def __init__(self, timestamps, values, name=None, tz=None, is_datetime=True, dtype=None):
+        '''
+        params
+        ========================================
+        timestamps: 1D array-like of int64
+            epoch nanoseconds (UTC) if is_datetime, otherwise numeric x-values (int64 or float64) or positions
+        values: 1D array-like
+        name: hashable, default=None
+        tz: str or tzinfo, default=None
+        is_datetime: bool, default=True
+        dtype: numpy.float32 or numpy.float64, default=None
+            if None; float32 values are kept, anything else is stored as float64
+        '''
+        timestamps = np.asarray(timestamps)
+        values = np.asarray(values)
+
+        if not is_datetime and timestamps.dtype.kind in 'iuf':
+            timestamps = timestamps.astype(np.float64 if timestamps.dtype.kind == 'f' else np.int64, copy=False)
+
+        if timestamps.dtype != np.int64 and (is_datetime or timestamps.dtype != np.float64):
+            msg = "Array Index Type ERROR: timestamps must be int64, but given {}".format(timestamps.dtype)
+            raise IndexTypeError(msg)
+
+        if timestamps.ndim != 1 or values.ndim != 1 or len(timestamps) != len(values):
+            msg = "Parameter Type ERROR: timestamps and values must be 1D arrays of the same length, but given {} and {}".format(timestamps.shape, values.shape)
+            raise ParameterTypeError(msg)
+
+        # NaT는 int64 최솟값으로 저장되어 정렬 시 맨 앞으로 오므로 미리 거부
+        if is_datetime and (timestamps == np.iinfo(np.int64).min).any():
+            msg = "Array Index Type ERROR: datetime index must not contain NaT"
+            raise IndexTypeError(msg)
+
+        if timestamps.dtype == np.float64 and np.isnan(timestamps).any():
+            msg = "Array Index Type ERROR: numeric index must not contain NaN"
+            raise IndexTypeError(msg)
+
+        values = values.astype(self._check_dtype(dtype, values), copy=False)
+
+        # 정렬되어 있지 않은 경우에만 한 번 정렬
+        if len(timestamps) > 1 and (np.diff(timestamps) < 0).any():
+            order = np.argsort(timestamps, kind='stable')
+            timestamps = timestamps[order]
+            values = values[order]
+
+        self.timestamps = timestamps
+        self.values = values
+        self.name = name
+        self.tz = tz
+        self.is_datetime = is_datetime
+
+    # constructors
+    @classmethod
+    def from_any(cls, arr, dtype=None):
+        '''
+        convert list, numpy.ndarray, pandas.Series or TimeSeries into a TimeSeries
+
+        a TimeSeries is returned as is if dtype does not ask for a conversion
+
+        params
+        ========================================
+        arr: array-like, list, pandas.Series or TimeSeries
+        dtype: numpy.float32 or numpy.float64, default=None
+
+        return
+        ========================================
+        TimeSeries
+        '''
+        if isinstance(arr, cls):
+            if dtype is None or arr.values.dtype == np.dtype(dtype):
+                return arr
+            return cls(arr.timestamps, arr.values, name=arr.name, tz=arr.tz,
+                       is_datetime=arr.is_datetime, dtype=dtype)
+
+        if isinstance(arr, pd.Series):
+            return cls.from_series(arr, dtype=dtype)
+
+        values = np.asarray(arr)
+        if values.ndim != 1:
+            msg = "Parameter Type ERROR: arr must be 1D, but given shape {}".format(values.shape)
+            raise ParameterTypeError(msg)
+
+        return cls(np.arange(len(values), dtype=np.int64), values, is_datetime=False, dtype=dtype)
+
+    @classmethod
+    def from_series(cls, s, dtype=None):
+        '''
+        convert a pandas.Series into a TimeSeries without copying
+        when the index is datetime64[ns] and the values already have the requested dtype
+
+        a numeric index (e.g. integer or float x-values) is kept as timestamps,
+        a RangeIndex or any other index is replaced by positions
+
+        params
+        ========================================
+        s: pandas.Series
+        dtype: numpy.float32 or numpy.float64, default=None
+
+        return
+        ========================================
+        TimeSeries
+        '''
+        index = s.index
+        tz = getattr(index, 'tz', None)
+
+        if isinstance(index, pd.DatetimeIndex):
+            timestamps = index.values.astype('datetime64[ns]', copy=False).view(np.int64)
+            is_datetime = True
+        elif pd.api.types.infer_dtype(index, skipna=False) in ('datetime', 'datetime64', 'date'):
+            try:
+                index = pd.DatetimeIndex(index)
+            except (TypeError, ValueError) as e:
+                msg = "Array Index Type ERROR: index could not be converted to datetime, {}".format(e)
+                raise IndexTypeError(msg)
+            tz = index.tz
+            timestamps = index.values.astype('datetime64[ns]', copy=False).view(np.int64)
+            is_datetime = True
+        elif not isinstance(index, pd.RangeIndex) and pd.api.types.is_numeric_dtype(index) \
+                and not pd.api.types.is_bool_dtype(index):
+            timestamps = index.to_numpy()
+            is_datetime = False
+        else:
+            timestamps = np.arange(len(s), dtype=np.int64)
+            is_datetime = False
+
+        values = s.to_numpy()
+        if not np.issubdtype(values.dtype, np.floating):
+            values = s.to_numpy(dtype=np.float64, na_value=np.nan)
+
+        return cls(timestamps, values, name=s.name, tz=tz, is_datetime=is_datetime, dtype=dtype)
+
+    # conversions
+    @property
+    def index(self):
+        ''' pandas.DatetimeIndex (or numeric Index) view of the timestamps '''
+
+        if not self.is_datetime:
+            return pd.Index(self.timestamps, copy=False)
+
+        index = pd.DatetimeIndex(self.timestamps.view('datetime64[ns]'), copy=False)
+        if self.tz is not None:
+            index = index.tz_localize('UTC').tz_convert(self.tz)
+
+        return index
+
+    def to_series(self):
+        ''' convert into a pandas.Series without copying the values '''
+
+        return pd.Series(self.values, index=self.index, name=self.name, copy=False)
+
+    def astype(self, dtype):
+        ''' return a TimeSeries whose values have the given dtype '''
+
+        return TimeSeries.from_any(self, dtype=dtype)
+
+    # calendar helpers
+    def weekday(self):
+        ''' day of week of every timestamp (Monday=0, Sunday=6) '''
+
+        self._check_datetime()
+        # 1970-01-01 은 목요일(3)
+        return ((self._local_ns() // 86400000000000) + 3) % 7
+
+    def day_of_month(self):
+        ''' day of month of every timestamp (1 ~ 31) '''
+
+        self._check_datetime()
+        days = (self._local_ns() // 86400000000000).astype('datetime64[D]')
+
+        return (days - days.astype('datetime64[M]')).astype(np.int64) + 1
+
+    # computations
+    def rolling_mean(self, period):
+        '''
+        moving average over the past period values, NaN for the first period - 1 values
+
+        params
+        ========================================
+        period: int
+
+        return
+        ========================================
+        TimeSeries
+        '''
+        if not isinstance(period, (int, np.integer)) or period < 1:
+            msg = "Parameter Type ERROR: period must be a positive integer, but given {}".format(period)
+            raise ParameterTypeError(msg)
+
+        values = self.values.astype(np.float64)
+        valid = ~np.isnan(values)
+        ma = np.full(len(values), np.nan)
+
+        # NaN이 포함된 window는 pandas.Series.rolling과 같이 NaN
+        if len(values) >= period:
+            csum = np.concatenate([[0.], np.cumsum(np.where(valid, values, 0.))])
+            ccount = np.concatenate([[0], np.cumsum(valid)])
+            window_sum = csum[period:] - csum[:-period]
+            window_sum[(ccount[period:] - ccount[:-period]) < period] = np.nan
+            ma[period - 1:] = window_sum / period
+
+        return TimeSeries(self.timestamps, ma.astype(self.values.dtype, copy=False), name=self.name,
+                          tz=self.tz, is_datetime=self.is_datetime)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __repr__(self):
+        return "TimeSeries(name={!r}, length={}, dtype={})".format(self.name, len(self), self.values.dtype)
+
+    # support methods
+    def _local_ns(self):
+        ''' timezone이 있으면 현지 시각 기준의 epoch ns를 반환하는 함수 '''
+
+        if self.tz is None:
+            return self.timestamps
+
+        return self.index.tz_localize(None).values.astype('datetime64[ns]', copy=False).view(np.int64)
+
+    def _check_datetime(self):
+        ''' timestamps가 datetime인지 확인하는 함수 '''
+
+        if not self.is_datetime:
+            msg = "Array Index Type ERROR: Must be datetime or timestamp, but given positional index"
+            raise IndexTypeError(msg)
+
+    def _check_dtype(self, dtype, values):
+        ''' 저장할 values의 dtype을 결정하는 함수 '''
+
+        if dtype is None:
+            return np.float32 if values.dtype == np.float32 else np.float64
+
+        if np.dtype(dtype) not in (np.dtype(np.float32), np.dtype(np.float64)):
+            msg = "Parameter Type ERROR: dtype must be float32 or float64, but given {}".format(dtype)
+            raise ParameterTypeError(msg)
+
+        return dtype